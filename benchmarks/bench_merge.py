@@ -0,0 +1,151 @@
+"""Benchmarks the deduplication and merge, after checking it against the previous per-group merge.
+
+Run from the project root:
+
+    python benchmarks/bench_merge.py
+"""
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'blanchot'))
+
+from dedup import near_duplicate_labels
+from run_synth import (Author, BlanchotWork, MERGED_COLUMNS, SOURCE_PRIORITY, deduplicate_and_merge,
+                       revive_duplicates, works_to_frame)
+
+RECORDS = 50000
+# Share of the records that repeat a DOI, or a title without a DOI, from another source.
+DUPLICATE_SHARE = 0.3
+REPEAT = 3
+
+
+def synthetic_work(i, rng, doi=True, distinct=int(RECORDS * (1 - DUPLICATE_SHARE))):
+    """Builds a record that repeats the work of other records when `distinct` is below their number."""
+    work_id = rng.randrange(distinct)
+    return BlanchotWork(
+        doi=f'https://doi.org/10.1000/{work_id}' if doi else None,
+        title=f'Blanchot and the neuter, part {work_id}', year=1960 + work_id % 60,
+        authors=[Author(full_name=f'Author {work_id % 997}')], is_open_access=bool(i % 2) if i % 5 else None,
+        subjects=[f'Subject {i % 7}'], source_url=f'https://example.org/{i}', citation_count=i % 40,
+        source_db=('OpenAlex', 'Crossref', 'HAL')[i % 3],
+        referenced_works=[f'https://openalex.org/W{rng.randint(1, 10**6)}' for _ in range(rng.randint(0, 5))],
+    )
+
+def previous_merge(df):
+    """The per-group merge deduplicate_and_merge() replaced, for the records with a DOI.
+
+    It follows the merge rules added since: records are ordered by source priority, then URL,
+    open access stays unknown if no source reports it, and cited key works are unioned.
+    """
+    df = df[df['doi'].notna()].copy()
+    df['doi'] = df['doi'].str.lower().str.strip().str.replace(r'https?://doi.org/', '', regex=True)
+    records = []
+    for doi, group in df.groupby('doi'):
+        group = group.assign(_priority=group['source_db'].map(SOURCE_PRIORITY), _url=group['source_url'].astype(str))
+        group = group.sort_values(['_priority', '_url'], kind='stable')
+
+        def best_value(field):
+            values = group[field].dropna()
+            return values.iloc[0] if not values.empty else None
+
+        def union(field):
+            return sorted({item for items in group[field].dropna() for item in items})
+
+        reported = group['is_open_access'].dropna()
+        records.append({
+            'doi': doi, 'title': best_value('title'),
+            'authors': max(group['authors'].dropna(), key=len, default=[]),
+            'editors': max(group['editors'].dropna(), key=len, default=[]),
+            'year': best_value('year'), 'publication_date': best_value('publication_date'),
+            'journal_name': best_value('journal_name'), 'publisher': best_value('publisher'),
+            'work_type': best_value('work_type'), 'language': best_value('language'),
+            'is_open_access': bool(reported.any()) if not reported.empty else None,
+            'abstract': best_value('abstract'), 'subjects': union('subjects'),
+            'source_url': best_value('source_url'), 'citation_count': group['citation_count'].max(),
+            'relation': best_value('relation'), 'source_db': ', '.join(sorted(group['source_db'].unique())),
+            'referenced_works': union('referenced_works'), 'cited_key_works': union('cited_key_works'),
+            'openalex_id': best_value('openalex_id'), 'hal_id': best_value('hal_id'),
+        })
+    return pd.DataFrame(records, columns=MERGED_COLUMNS)
+
+def check_against_previous_merge():
+    """Merges a small mixed frame and compares it with the previous merge and an independent count.
+
+    The records with a DOI must merge exactly as before. The records without a DOI repeat a
+    title, year and first author only when they describe the same work, so they must merge into
+    one record per work.
+    """
+    rng = random.Random(0)
+    works = [synthetic_work(i, rng, doi=i % 4 != 0, distinct=60) for i in range(300)]
+    expected = len({work.doi for work in works if work.doi}) + len({work.title for work in works if not work.doi})
+
+    merged = deduplicate_and_merge(works_to_frame(works))
+    assert list(merged.columns) == MERGED_COLUMNS
+    assert len(merged) == expected, (len(merged), expected)
+    with_doi = merged[merged['doi'].notna()].reset_index(drop=True)
+    previous = previous_merge(works_to_frame(works))
+    assert with_doi.to_csv(index=False) == previous.to_csv(index=False)
+
+def check_one_kind_of_record():
+    """Merges inputs where every record has a DOI, none has, and no record at all."""
+    rng = random.Random(0)
+    for name, works in (('all with a DOI', [synthetic_work(i, rng, distinct=40) for i in range(100)]),
+                        ('none with a DOI', [synthetic_work(i, rng, doi=False, distinct=40) for i in range(100)]),
+                        ('empty', [])):
+        expected = len({(work.doi, work.title) for work in works})
+        merged = deduplicate_and_merge(works_to_frame(works))
+        assert list(merged.columns) == MERGED_COLUMNS, name
+        assert len(merged) == expected, (name, len(merged), expected)
+
+def check_volumes_stay_apart():
+    """Keeps the volumes and parts of a work apart, while merging copies of each one."""
+    titles = ['Maurice Blanchot et la littérature, tome 1', 'Maurice Blanchot et la littérature, tome 2',
+              'Lectures de Blanchot I', 'Lectures de Blanchot II', 'Lectures de Blanchot II',
+              "L'espace littéraire de Blanchot", "L'espace litteraire de Blanchot"]
+    labels = near_duplicate_labels(titles, [2001] * len(titles), ['Jean Dupont'] * len(titles))
+    assert labels.tolist() == [0, 1, 2, 3, 3, 5, 5], labels
+
+def check_revived_duplicates():
+    """Revives the set-aside records that share a DOI or a near-duplicate title with a kept one,
+    or with other set-aside records whose bounds add up to the threshold."""
+    def work(i, doi, title):
+        return BlanchotWork(doi=doi, title=title, year=1955, authors=[Author(full_name='Author')],
+                            source_url=f'https://example.org/{i}', source_db=('OpenAlex', 'HAL')[i % 2])
+
+    kept = [work(0, 'https://doi.org/10.1000/1', 'The space of literature'), work(1, None, 'Thomas the obscure')]
+    pending = [work(2, '10.1000/1', 'The space of literature'), work(3, None, 'Thomas the obscure'),
+               work(4, None, 'Death sentence'), work(5, '10.1000/2', 'The writing of the disaster'),
+               work(6, '', 'The last man'), work(7, None, 'Blanchot and the outside'),
+               work(8, None, 'Blanchot and the outside'), work(9, '10.1000/3', 'The infinite conversation'),
+               work(10, '10.1000/3', 'The infinite conversation')]
+    def bound(work):
+        return 4 if 'Blanchot' in work.title else 0
+
+    revived, clusters = revive_duplicates(kept, pending, bound, threshold=8)
+    assert revived == pending[:2] + pending[5:7], [work.source_url for work in revived]
+    assert len(clusters) == len(kept) + len(revived)
+    assert clusters[1] == clusters[3] != -1 and clusters[0] == clusters[2] == -1, clusters
+    assert clusters[4] == clusters[5] not in (-1, clusters[1]), clusters
+
+def main():
+    check_against_previous_merge()
+    check_one_kind_of_record()
+    check_volumes_stay_apart()
+    check_revived_duplicates()
+    rng = random.Random(0)
+    works = [synthetic_work(i, rng, doi=i % 4 != 0) for i in range(RECORDS)]
+    best = float('inf')
+    for _ in range(REPEAT):
+        df = works_to_frame(works)
+        started = time.perf_counter()
+        merged = deduplicate_and_merge(df)
+        best = min(best, time.perf_counter() - started)
+    print(f"\n{RECORDS} records, a quarter without a DOI, best of {REPEAT}")
+    print(f"deduplicate_and_merge: {best:.2f} s ({len(merged)} merged records)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""Benchmarks OpenAlex page validation: the typed page path against the previous per-record dict round trip.
+
+The previous path is measured with a copy of the model it validated with, before the ISSN check
+moved into pydantic-core and the abstract index was passed through unchecked.
+
+Run from the project root:
+
+    python benchmarks/bench_openalex_validation.py
+"""
+import json
+import os
+import random
+import re
+import sys
+import time
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'blanchot'))
+
+from openalex import _validator
+
+PAGES = 10
+PER_PAGE = 200
+REPEAT = 5
+
+
+class PreviousAuthor(BaseModel):
+    id: str
+    display_name: str
+    orcid: Optional[str] = None
+
+class PreviousAuthorship(BaseModel):
+    author: PreviousAuthor
+
+class PreviousSource(BaseModel):
+    id: str
+    display_name: str
+    issn_l: Optional[str] = Field(pattern=r'^\d{4}-\d{3}[\dX]$')
+    issn: Optional[list[str]]
+    host_organization: Optional[str]
+    type: Literal['journal', 'repository', 'conference', 'ebook platform', 'book series', 'metadata', 'other']
+
+    @model_validator(mode='after')
+    def validate_issn(self):
+        if self.issn is not None:
+            for issn in self.issn:
+                if not re.fullmatch(r'^\d{4}-\d{3}[\dX]$', issn):
+                    raise ValueError("Issn(s) formatted incorrectly")
+        return self
+
+class PreviousLocation(BaseModel):
+    is_oa: bool
+    landing_page_url: Optional[str]
+    pdf_url: Optional[str] = None
+    source: Optional[PreviousSource]
+    license: Optional[str] = None
+    version: Optional[Literal['publishedVersion', 'acceptedVersion', 'submittedVersion']] = None
+    is_accepted: bool
+    is_published: bool
+
+class PreviousOpenAlexWork(BaseModel):
+    """OpenAlexWork as the previous path validated it."""
+    model_config = ConfigDict(extra='allow')
+    id: str
+    doi: Optional[str] = None
+    title: Optional[str]
+    authorships: List[PreviousAuthorship]
+    primary_location: Optional[PreviousLocation] = None
+    locations: List[PreviousLocation] = []
+    type: str
+    publication_date: str
+    publication_year: int
+    language: Optional[str] = None
+    cited_by_count: int
+    referenced_works: List[str]
+    abstract_inverted_index: Optional[Dict[str, List[int]]] = None
+
+
+def synthetic_work(i, rng):
+    """Builds a work shaped like an OpenAlex response restricted to OPENALEX_FIELDS."""
+    source = {
+        'id': f'https://openalex.org/S{i % 300}', 'display_name': f'Journal {i % 300}',
+        'issn_l': '1234-567X', 'issn': ['1234-567X', '2345-6789'],
+        'host_organization': 'https://openalex.org/P1', 'type': 'journal',
+    }
+    authorships = [{
+        'author_position': 'first',
+        'author': {'id': f'https://openalex.org/A{i}{k}', 'display_name': f'Author {k}', 'orcid': None},
+        'institutions': [{
+            'id': 'https://openalex.org/I1', 'display_name': 'Université', 'ror': 'https://ror.org/1',
+            'country_code': 'FR', 'type': 'education', 'lineage': ['https://openalex.org/I1'],
+        }],
+        'countries': ['FR'], 'is_corresponding': False,
+        'affiliations': [{'raw_affiliation_string': 'Université', 'institution_ids': ['https://openalex.org/I1']}],
+    } for k in range(rng.randint(1, 4))]
+    words = [f'word{j}' for j in range(rng.randint(50, 200))]
+    inverted_index = {}
+    for position, word in enumerate(rng.choices(words, k=len(words))):
+        inverted_index.setdefault(word, []).append(position)
+    return {
+        'id': f'https://openalex.org/W{i}', 'doi': f'https://doi.org/10.1000/{i}', 'title': f'Blanchot {i}',
+        'authorships': authorships,
+        'concepts': [{'id': f'https://openalex.org/C{c}', 'display_name': f'Concept {c}', 'level': 1, 'score': 0.5}
+                     for c in range(8)],
+        'primary_location': {
+            'is_oa': bool(i % 2), 'landing_page_url': f'https://doi.org/10.1000/{i}', 'pdf_url': None,
+            'source': source, 'license': None, 'version': 'publishedVersion',
+            'is_accepted': True, 'is_published': True,
+        },
+        'open_access': {'is_oa': bool(i % 2), 'oa_status': 'gold', 'oa_url': None},
+        'type': 'article', 'publication_date': '2001-01-01', 'publication_year': 2001, 'language': 'fr',
+        'cited_by_count': i % 40,
+        'referenced_works': [f'https://openalex.org/W{rng.randint(1, 10**9)}' for _ in range(rng.randint(0, 40))],
+        'abstract_inverted_index': inverted_index,
+    }
+
+def dict_round_trip(works):
+    """The previous path: validate each work with the previous model, dump it, then regex its short ID."""
+    records = []
+    for work in works:
+        record = PreviousOpenAlexWork.model_validate(work).model_dump()
+        record['short_id'] = re.search(r'[A-Z]\d+', str(record['id'])).group()
+        records.append(record)
+    return records
+
+def typed_page(works):
+    return _validator().validate(works)
+
+def time_per_record(func, pages):
+    best = float('inf')
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        for page in pages:
+            func(page)
+        best = min(best, time.perf_counter() - started)
+    return best / (len(pages) * PER_PAGE) * 1e6
+
+
+def main():
+    rng = random.Random(0)
+    bodies = [
+        json.dumps({'results': [synthetic_work(p * PER_PAGE + i, rng) for i in range(PER_PAGE)]}).encode()
+        for p in range(PAGES)
+    ]
+    pages = [json.loads(body)['results'] for body in bodies]
+
+    decode = time_per_record(lambda body: json.loads(body), bodies)
+    baseline = time_per_record(dict_round_trip, pages)
+    fast = time_per_record(typed_page, pages)
+    print(f"{PAGES} pages x {PER_PAGE} works, best of {REPEAT}")
+    print(f"JSON decode (shared by both):    {decode:7.1f} us/work")
+    print(f"previous model, validate + dump: {baseline:7.1f} us/work")
+    print(f"typed page validation:           {fast:7.1f} us/work ({baseline / fast:.1f}x faster)")
+
+if __name__ == '__main__':
+    main()
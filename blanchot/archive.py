@@ -0,0 +1,83 @@
+import glob
+import gzip
+import json
+import os
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVE_DIR = os.environ.get('BLANCHOT_ARCHIVE_DIR', os.path.join(PROJECT_ROOT, 'archive'))
+REPLAY_PAGE_SIZE = 1000
+
+
+class RawArchive:
+    """Append-only, gzip-compressed JSONL archive of the raw records one harvest of a source returns.
+
+    Every harvest writes a new `<source>/<timestamp>-<full|delta>.jsonl.gz` file, one raw API
+    record per line. It is written under a `.part` name and only published by close() once the
+    harvest has finished, so an interrupted run never leaves a partial archive behind for replay.
+    Pages may be written from several threads.
+    """
+
+    def __init__(self, source, since=None, directory=ARCHIVE_DIR):
+        stamp = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())
+        kind = 'delta' if since else 'full'
+        self.path = os.path.join(directory, source, f"{stamp}-{kind}.jsonl.gz")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = gzip.open(f"{self.path}.part", 'wt', encoding='utf-8')
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def write(self, records):
+        """Appends a page of raw records."""
+        lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        with self._lock:
+            self._file.write(lines)
+            self.count += len(records)
+
+    def close(self):
+        """Finishes the archive and makes it available to replay."""
+        with self._lock:
+            self._file.close()
+            os.replace(f"{self.path}.part", self.path)
+        print(f"Archived {self.count} raw records to {self.path}")
+
+
+def _replay_files(source, directory=ARCHIVE_DIR):
+    """Returns the archives a replay needs, newest first: every delta back to the latest full harvest."""
+    files = sorted(glob.glob(os.path.join(directory, source, '*.jsonl.gz')), reverse=True)
+    for i, path in enumerate(files):
+        if path.endswith('-full.jsonl.gz'):
+            return files[:i + 1]
+    return files
+
+def iter_archived_pages(source, key, directory=ARCHIVE_DIR, page_size=REPLAY_PAGE_SIZE):
+    """Yields pages of the archived raw records of a source, as the last harvests left them.
+
+    Reads the latest full harvest and the delta harvests after it, newest first. A record that
+    was archived more than once (identified by its `key` field) is only yielded in its newest
+    version. A source that was never archived yields nothing, with a warning.
+    """
+    paths = _replay_files(source, directory)
+    if not paths:
+        print(f"Warning: No archived {source} harvest under {os.path.join(directory, source)}; "
+              f"replaying it as empty.")
+        return
+
+    seen_keys = set()
+    page = []
+    for path in paths:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                record_key = record.get(key)
+                if record_key is not None:
+                    if record_key in seen_keys:
+                        continue
+                    seen_keys.add(record_key)
+                page.append(record)
+                if len(page) >= page_size:
+                    yield page
+                    page = []
+    if page:
+        yield page
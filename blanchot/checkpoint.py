@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+import re
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHECKPOINT_DIR = os.environ.get('BLANCHOT_CHECKPOINT_DIR', os.path.join(PROJECT_ROOT, '.cache', 'checkpoints'))
+# Checkpoints older than this belong to an abandoned run and are started over.
+CHECKPOINT_MAX_AGE = 24 * 60 * 60
+
+
+class Checkpoint:
+    """Append-only on-disk log of the raw records a harvest has fetched, plus where to resume.
+
+    Every saved page appends its records to `<name>.jsonl` and then atomically rewrites
+    `<name>.json` with the resume position and the number of records written so far. A crash in
+    between leaves at most a partial page at the end of the log; load() drops it, so the log and
+    the position always agree.
+    """
+
+    def __init__(self, name, directory=CHECKPOINT_DIR):
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', name).strip('-')[:60]
+        digest = hashlib.sha1(name.encode('utf-8')).hexdigest()[:12]
+        self.records_path = os.path.join(directory, f"{slug}-{digest}.jsonl")
+        self.state_path = os.path.join(directory, f"{slug}-{digest}.json")
+        self._count = 0
+
+    def load(self):
+        """Returns (records, state) saved by an interrupted run, or ([], {}) to start fresh."""
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+            if time.time() - state.get('saved_at', 0) > CHECKPOINT_MAX_AGE:
+                raise ValueError("stale checkpoint")
+            count = state.pop('count', 0)
+            records = []
+            with open(self.records_path, 'rb+') as f:
+                for _ in range(count):
+                    records.append(json.loads(f.readline()))
+                f.truncate(f.tell())
+        except (FileNotFoundError, ValueError):
+            # json.JSONDecodeError is a ValueError too: a missing or damaged log means starting over.
+            self.clear()
+            return [], {}
+        self._count = count
+        return records, state
+
+    def save(self, records, **state):
+        """Appends a page of raw records and records the position to resume from after it."""
+        os.makedirs(os.path.dirname(self.records_path), exist_ok=True)
+        with open(self.records_path, 'ab') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._count += len(records)
+
+        state = dict(state, count=self._count, saved_at=time.time())
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def clear(self):
+        """Removes the checkpoint once its harvest has finished."""
+        for path in (self.state_path, self.records_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._count = 0
@@ -1,104 +1,160 @@
-from crossref.restful import Works
-import pandas as pd
-from pydantic import ValidationError
-from tqdm import tqdm
+import re
 import time
-
-from .models import CrossrefWorkModel
-
-works_api = Works()
-
-current_year = time.localtime().tm_year
-
-works_query = works_api.query(bibliographic="Blanchot").filter(
-    from_pub_date='1998',
-    until_pub_date=str(current_year)
-).sort('published').order('asc')
-
-def get_cr_work():
-    validated_records = []
-    failed_records = []
-
-    try:
-        for work_data in tqdm(works_query, total=works_query.count(), desc="Downloading"):
-            try:
-                validated_work = CrossrefWorkModel.model_validate(work_data)
-                validated_records.append(validated_work)
-            except ValidationError as e:
-                failed_records.append({'doi': work_data.get('DOI'), 'error': str(e)})
-    except Exception as e:
-        print(f"An unexpected error occurred during download: {e}")
-
+from functools import lru_cache, partial
+
+from archive import RawArchive, iter_archived_pages
+from checkpoint import Checkpoint
+from harvest import iter_concurrently
+from paging import PageValidator, Progress, iter_cursor_pages
+from transport import get_json
+
+from .models import CrossrefWorkModel, CROSSREF_FIELDS
+
+BASE_URL = "https://api.crossref.org/works"
+QUERY = "Blanchot"
+START_YEAR = 1998
+ROWS_PER_PAGE = 1000  # The largest page Crossref serves.
+CR_WORKERS = 4
+# Crossref forgets a cursor five minutes after its last use.
+CURSOR_LIFETIME = 4 * 60
+ARCHIVE_NAME = 'crossref'
+
+# Crossref's bibliographic search is broad; only records from publishers matching one of these
+# keywords are kept.
+ACADEMIC_KEYWORDS = [
+    # --- Core Disciplines & Theories ---
+    'Philosophy', 'Philosophie', 'Filosofia', 'Filosofía',
+    'Literature', 'Literary', 'Linguistics', 'Poetics',
+    'Humanities', 'Theory', 'Critical', 'Deconstruction',
+    'Phenomenology', 'Psychoanalysis', 'Aesthetics', 'Cultural Studies',
+
+    # --- Institutional & Publisher Types ---
+    'University Press', 'University', 'Press', 'Academic',
+    'College', 'Institute', 'Institut', 'Centro', 'Centre',
+    'Society', 'Société', 'Sociedad',
+
+    # --- Publication Types (English) ---
+    'Journal', 'Review', 'Studies', 'Quarterly', 'Annual', 'Annals',
+    'Proceedings', 'Transactions', 'Bulletin', 'Archive', 'Yearbook',
+
+    # --- Publication Types (Foreign Languages) ---
+    # French
+    'Revue', 'Cahiers', 'Études', 'Annales', 'Presses',
+    # German
+    'Zeitschrift', 'Kritik', 'Jahrbuch', 'Archiv', 'Verlag',
+    # Italian
+    'Rivista', 'Studi', 'Annali',
+    # Spanish / Portuguese
+    'Revista', 'Estudios', 'Anales',
+    # Latin
+    'Acta'
+]
+ACADEMIC_PUBLISHER = re.compile('|'.join(ACADEMIC_KEYWORDS), re.IGNORECASE)
+
+@lru_cache(maxsize=None)
+def is_academic_publisher(publisher: str) -> bool:
+    """Tells whether a publisher name matches one of ACADEMIC_KEYWORDS; a few thousand names recur."""
+    return ACADEMIC_PUBLISHER.search(publisher) is not None
+
+def _resume_date(work):
+    """Returns the `published` date of a record as a from-pub-date value."""
+    date_parts = (work.get('published') or {}).get('date-parts') or [[]]
+    return '-'.join(f"{part:02d}" for part in date_parts[0] if part) or None
+
+def _year_filter(year, since=None):
+    filters = f'from-pub-date:{year},until-pub-date:{year}'
+    if since:
+        # Only records deposited or updated since the last run (a delta harvest).
+        filters += f',from-update-date:{since}'
+    return filters
+
+def _year_checkpoint(filters):
+    return Checkpoint(f"crossref {QUERY} {filters}")
+
+def _fetch_page(filters, cursor):
+    """Fetches the page of records at `cursor`, returning (raw records, next cursor, total)."""
+    params = {
+        'query.bibliographic': QUERY,
+        'filter': filters,
+        # `published` is the sort key, kept so an expired cursor can be resumed by date.
+        'select': ','.join(CROSSREF_FIELDS + ['published']),
+        'rows': ROWS_PER_PAGE,
+        'cursor': cursor,
+        'sort': 'published',
+        'order': 'asc'
+    }
+    message = get_json(BASE_URL, params).get('message', {})
+    items = message.get('items', [])
+    # A short page is the last one.
+    next_cursor = message.get('next-cursor') if len(items) == ROWS_PER_PAGE else None
+    return items, next_cursor, message.get('total-results', 0)
+
+def _harvest_year(year, progress, since=None):
+    """Walks a deep-paging cursor over one publication year, yielding every page of raw records.
+
+    Every page is checkpointed. A restarted run resumes the cursor if Crossref still remembers
+    it; otherwise it restarts the year from the `published` date of the last saved record (the
+    results are sorted on it), and the DOI dedup in iter_cr_work() drops the overlap. Finished
+    years are skipped; iter_cr_work() clears the checkpoints once every year is done.
+    """
+    filters = _year_filter(year, since)
+
+    def restart(works, state):
+        nonlocal filters
+        if time.time() - state['saved_at'] > CURSOR_LIFETIME and _resume_date(works[-1]):
+            filters = filters.replace(f'from-pub-date:{year}', f'from-pub-date:{_resume_date(works[-1])}')
+            return '*'
+        return state['cursor']
+
+    yield from iter_cursor_pages(_year_checkpoint(filters), lambda cursor: _fetch_page(filters, cursor),
+                                 progress, year, restart)
+
+def _academic_page(page):
+    """Keeps the raw records from academic publishers, so the others are never validated."""
+    return [work for work in page if isinstance(work.get('publisher'), str) and is_academic_publisher(work['publisher'])]
+
+def _validator():
+    return PageValidator(CrossrefWorkModel, key='DOI', raw_key='DOI')
+
+def iter_cr_work(max_workers=CR_WORKERS, since=None):
+    """Harvests Crossref, yielding validated, deduplicated records from academic publishers one page at a time.
+
+    Only the DOIs already seen are kept, to drop records that came up in an earlier page.
+    """
+    validator = _validator()
+    skipped_count = 0
+
+    current_year = time.localtime().tm_year
+    years = range(START_YEAR, current_year + 1)
+    archive = RawArchive(ARCHIVE_NAME, since)
+    # One cursor per publication year; the total comes from each year's first page, so no
+    # separate count request is needed.
+    with Progress(desc="Downloading", unit='work') as progress:
+        pages = iter_concurrently(
+            [partial(_harvest_year, year, progress, since) for year in years],
+            max_workers, thread_name_prefix='crossref'
+        )
+        for page in pages:
+            archive.write(page)
+            academic = _academic_page(page)
+            skipped_count += len(page) - len(academic)
+            yield validator.new_records(validator.validate(academic))
+    archive.close()
+    for year in years:
+        _year_checkpoint(_year_filter(year, since)).clear()
 
     print(f"\nDownload complete.")
-    print(f"Total validated records: {len(validated_records)}")
-    if failed_records:
-        print(f"Total records that failed validation: {len(failed_records)}")
-
-
-    original_count = len(validated_records)
-    unique_records_builder = []
-    seen_dois = set()
-    duplicate_log = []
-
-    for work in validated_records:
-        doi = work.DOI
-
-        if doi not in seen_dois:
-            unique_records_builder.append(work)
-            seen_dois.add(doi)
-        else:
-            duplicate_log.append({
-                "DOI": doi,
-                "title": work.title[0] if work.title else "No Title"
-            })
-
-    validated_records = unique_records_builder
-    final_count = len(validated_records)
-
-    print(f"Unique records: {final_count}")
-    print(f"Duplicates removed: {original_count - final_count}")
-
-
-    df = pd.DataFrame([work.model_dump(by_alias=True) for work in validated_records])
-    print(f"\nCreated DataFrame with {len(df)} records for filtering.")
-
-    if 'publisher' in df.columns:
-        # TODO:EXPAND LIST -- EXPANDED BELOW
-        academic_keywords = [
-            # --- Core Disciplines & Theories ---
-            'Philosophy', 'Philosophie', 'Filosofia', 'Filosofía',
-            'Literature', 'Literary', 'Linguistics', 'Poetics',
-            'Humanities', 'Theory', 'Critical', 'Deconstruction',
-            'Phenomenology', 'Psychoanalysis', 'Aesthetics', 'Cultural Studies',
-            
-            # --- Institutional & Publisher Types ---
-            'University Press', 'University', 'Press', 'Academic',
-            'College', 'Institute', 'Institut', 'Centro', 'Centre',
-            'Society', 'Société', 'Sociedad',
-            
-            # --- Publication Types (English) ---
-            'Journal', 'Review', 'Studies', 'Quarterly', 'Annual', 'Annals',
-            'Proceedings', 'Transactions', 'Bulletin', 'Archive', 'Yearbook',
-            
-            # --- Publication Types (Foreign Languages) ---
-            # French
-            'Revue', 'Cahiers', 'Études', 'Annales', 'Presses',
-            # German
-            'Zeitschrift', 'Kritik', 'Jahrbuch', 'Archiv', 'Verlag',
-            # Italian
-            'Rivista', 'Studi', 'Annali',
-            # Spanish / Portuguese
-            'Revista', 'Estudios', 'Anales',
-            # Latin
-            'Acta'
-        ]
-        
-        search_pattern = '|'.join(academic_keywords)
-        
-        df_filtered = df[df['publisher'].str.contains(search_pattern, case=False, na=False)]
-        return df_filtered.to_dict('records')
-        
-    else:
-        print("\nWarning: 'publisher' column not found in the downloaded data. Cannot perform filtering.")
-        return None
\ No newline at end of file
+    validator.report()
+    print(f"Skipped {skipped_count} records from non-academic publishers before validation.")
+    print(f"Unique records from academic publishers: {len(validator.seen)}")
+
+def replay_cr_work():
+    """Rebuilds the Crossref records from the raw-record archive, without touching the network."""
+    validator = _validator()
+    for page in iter_archived_pages(ARCHIVE_NAME, key='DOI'):
+        yield validator.new_records(validator.validate(_academic_page(page)))
+    print(f"\nReplayed {len(validator.seen)} archived Crossref records.")
+
+def get_cr_work(max_workers=CR_WORKERS, since=None):
+    """Harvests Crossref into a single list of validated, deduplicated records from academic publishers."""
+    return [record for page in iter_cr_work(max_workers, since) for record in page]
@@ -1,6 +1,13 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 
+# Fields read by from_crossref_to_blanchotwork; get_cr_work() selects only these. `language` is
+# not one of Crossref's selectable fields, so OpenAlex/HAL remain the language source.
+CROSSREF_FIELDS = [
+    'DOI', 'URL', 'title', 'author', 'editor', 'publisher', 'type', 'published-print',
+    'published-online', 'container-title', 'subject', 'is-referenced-by-count', 'relation',
+]
+
 class DateParts(BaseModel):
     date_parts: Optional[List[List[Optional[int]]]] = Field(None, alias='date-parts')
 
@@ -12,12 +19,18 @@ class Author(BaseModel):
 
 class CrossrefWorkModel(BaseModel):
     DOI: str
+    URL: Optional[str] = None
     title: List[str]
     author: Optional[List[Author]] = None
+    editor: Optional[List[Author]] = None
     publisher: str
     type: str
     published_print: Optional[DateParts] = Field(None, alias='published-print')
-    
+    published_online: Optional[DateParts] = Field(None, alias='published-online')
+    container_title: Optional[List[str]] = Field(None, alias='container-title')
+    subject: Optional[List[str]] = None
+    is_referenced_by_count: Optional[int] = Field(None, alias='is-referenced-by-count')
+    relation: Optional[Dict[str, Any]] = None
+
     class Config:
-        extra = 'allow' 
         populate_by_name = True
\ No newline at end of file
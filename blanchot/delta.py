@@ -0,0 +1,72 @@
+import dataclasses
+import datetime
+import gzip
+import json
+import os
+
+
+OUTPUTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'outputs')
+STATE_FILE = os.path.join(OUTPUTS_DIR, 'harvest_state.json')
+SNAPSHOT_FILE = os.path.join(OUTPUTS_DIR, 'records.jsonl.gz')
+
+# A record is identified by the source it came from and its URL in that source.
+RECORD_KEY = ['source_db', 'source_url']
+
+
+def load_state(path=STATE_FILE) -> dict:
+    """Loads the state left by the last successful run, or an empty state if there is none."""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save_state(watermark: str, record_count: int, path=STATE_FILE):
+    """Records the watermark the next delta run should harvest from."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'watermark': watermark, 'record_count': record_count}, f, indent=2)
+
+def today() -> str:
+    """Returns today's UTC date, the watermark for a run that starts now."""
+    return datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+
+def _to_jsonable(obj):
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump()
+    if hasattr(obj, 'item'):
+        return obj.item()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+def save_snapshot(records, path=SNAPSHOT_FILE):
+    """Saves the translated, not yet merged per-source records for the next delta run."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, default=_to_jsonable, ensure_ascii=False) + '\n')
+    os.replace(tmp_path, path)
+
+def load_snapshot(path=SNAPSHOT_FILE) -> list:
+    """Loads the per-source records saved by the last run, or an empty list if there are none."""
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+    except FileNotFoundError:
+        return []
+
+def _record_key(record) -> tuple:
+    return tuple(str(getattr(record, field)) for field in RECORD_KEY)
+
+def unchanged_records(previous: list, changed: list) -> list:
+    """Returns the previous records that no changed record replaces, to upsert the changed ones into."""
+    if not changed:
+        print(f"No changed records; keeping the {len(previous)} previous ones.")
+        return previous
+    changed_keys = {_record_key(record) for record in changed}
+    kept = [record for record in previous if _record_key(record) not in changed_keys]
+    print(f"Upserted {len(changed)} changed records into {len(previous)} previous ones "
+          f"({len(previous) - len(kept)} replaced).")
+    return kept
@@ -0,0 +1,108 @@
+import gzip
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from openalex import iter_oa_works_by_doi, OA_WORKERS
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENRICHMENT_CACHE_FILE = os.environ.get(
+    'BLANCHOT_ENRICHMENT_CACHE', os.path.join(PROJECT_ROOT, '.cache', 'enrichment', 'openalex-dois.jsonl.gz')
+)
+# Lookups are reused for this long, after which a DOI is asked about again, found or not.
+ENRICHMENT_CACHE_TTL = float(os.environ.get('BLANCHOT_ENRICHMENT_CACHE_TTL', 30 * 24 * 60 * 60))
+
+
+def normalize_doi(doi) -> Optional[str]:
+    """Lowercases a DOI and strips its resolver prefix, or returns None for a missing one."""
+    if not isinstance(doi, str):
+        return None
+    doi = doi.strip().lower()
+    for prefix in ('https://doi.org/', 'http://doi.org/', 'https://dx.doi.org/', 'http://dx.doi.org/'):
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+            break
+    return doi or None
+
+
+class DoiCache:
+    """On-disk cache of OpenAlex DOI lookups: the raw work for each DOI, or None if OpenAlex had none.
+
+    Kept as one gzip-compressed JSONL file that is loaded whole and rewritten atomically on save.
+    """
+
+    def __init__(self, path=ENRICHMENT_CACHE_FILE, ttl=ENRICHMENT_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.entries = {}
+        self._changed = False
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.entries[entry['doi']] = (entry['fetched_at'], entry['work'])
+        except (FileNotFoundError, EOFError, OSError, ValueError):
+            # A missing or damaged cache only means looking the DOIs up again.
+            self.entries = {}
+
+    def lookup(self, doi):
+        """Returns (True, work or None) for a fresh entry, or (False, None) if the DOI must be fetched."""
+        entry = self.entries.get(doi)
+        if entry is None or time.time() - entry[0] > self.ttl:
+            return False, None
+        return True, entry[1]
+
+    def put(self, doi, work):
+        self.entries[doi] = (time.time(), work)
+        self._changed = True
+
+    def save(self):
+        if not self._changed:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            for doi, (fetched_at, work) in self.entries.items():
+                f.write(json.dumps({'doi': doi, 'fetched_at': fetched_at, 'work': work}, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.path)
+        self._changed = False
+
+
+def resolve_dois(dois, max_workers=OA_WORKERS, offline=False, cache_path=ENRICHMENT_CACHE_FILE) -> Dict[str, dict]:
+    """Returns the raw OpenAlex work of every DOI OpenAlex knows, keyed by normalized DOI.
+
+    Cached lookups are reused; the rest go out in batched `doi:` filter requests. Offline, only
+    the cache is read. DOIs OpenAlex does not know are cached as such too, so a later run does
+    not ask about them again until the entry expires. Batches OpenAlex rejects are skipped and
+    left out of the cache, so they are asked about again next run.
+    """
+    cache = DoiCache(cache_path)
+    resolved, missing = {}, []
+    for doi in dict.fromkeys(normalize_doi(doi) for doi in dois):
+        if doi is None:
+            continue
+        hit, work = cache.lookup(doi)
+        if not hit:
+            missing.append(doi)
+        elif work is not None:
+            resolved[doi] = work
+    print(f"{len(dois)} DOIs to resolve against OpenAlex: {len(resolved)} found in the cache, "
+          f"{len(missing)} {'not cached (offline)' if offline else 'to look up'}.")
+    if offline or not missing:
+        return resolved
+
+    try:
+        for batch, works in iter_oa_works_by_doi(missing, max_workers):
+            found = {}
+            for work in works:
+                # Of several works sharing a DOI, keep the first, which OpenAlex ranks best.
+                found.setdefault(normalize_doi(work.get('doi')), work)
+            for doi in batch:
+                cache.put(doi, found.get(doi))
+                if doi in found:
+                    resolved[doi] = found[doi]
+    finally:
+        # Lookups made before an error are kept for the next run.
+        cache.save()
+    return resolved
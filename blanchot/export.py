@@ -0,0 +1,89 @@
+import json
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARQUET_DIR = os.path.join(PROJECT_ROOT, 'outputs', 'parquet')
+
+AUTHOR = pa.struct([('full_name', pa.string()), ('given_name', pa.string()), ('family_name', pa.string())])
+# Few distinct values, many repeats: stored once in a dictionary, read back as categoricals.
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+SCHEMA = pa.schema([
+    ('doi', pa.string()),
+    ('title', pa.string()),
+    ('authors', pa.list_(AUTHOR)),
+    ('editors', pa.list_(AUTHOR)),
+    ('year', pa.int32()),
+    ('publication_date', pa.string()),
+    ('journal_name', CATEGORY),
+    ('publisher', CATEGORY),
+    ('work_type', CATEGORY),
+    ('language', CATEGORY),
+    ('is_open_access', pa.bool_()),
+    ('abstract', pa.string()),
+    ('subjects', pa.list_(pa.string())),
+    ('source_url', pa.string()),
+    ('citation_count', pa.int64()),
+    # Crossref relations are free-form nested objects, so they are kept as JSON text.
+    ('relation', pa.string()),
+    ('source_db', CATEGORY),
+    ('referenced_works', pa.list_(pa.string())),
+    ('cited_key_works', pa.list_(pa.string())),
+    ('openalex_id', pa.string()),
+    ('hal_id', pa.string()),
+    ('relevance_score', pa.int64()),
+    ('key_work_citations', pa.int64()),
+    ('second_hop_citations', pa.int64()),
+    ('citation_rank', pa.float64()),
+])
+PARTITIONING = ds.partitioning(pa.schema([('year', pa.int32())]), flavor='hive')
+
+
+def _authors(value):
+    if not isinstance(value, list):
+        return None
+    return [{'full_name': author.full_name, 'given_name': author.given_name, 'family_name': author.family_name}
+            for author in value]
+
+def _column(values: pd.Series, field: pa.Field) -> pa.Array:
+    if field.type == CATEGORY:
+        return pa.array(values, pa.string(), from_pandas=True).dictionary_encode()
+    if field.type == pa.list_(AUTHOR):
+        return pa.array([_authors(value) for value in values], field.type)
+    if pa.types.is_list(field.type):
+        return pa.array([value if isinstance(value, list) else None for value in values], field.type)
+    if field.name == 'relation':
+        return pa.array([json.dumps(value) if isinstance(value, dict) else None for value in values], field.type)
+    if pa.types.is_integer(field.type):
+        values = pd.to_numeric(values, errors='coerce').astype('Int64')
+    return pa.array(values, field.type, from_pandas=True)
+
+def works_table(df: pd.DataFrame) -> pa.Table:
+    """Converts scored works to an Arrow table with SCHEMA: native lists, structs and dictionaries.
+
+    Abstracts must already be text.
+    """
+    return pa.Table.from_arrays([_column(df[field.name], field) for field in SCHEMA], schema=SCHEMA)
+
+def write_parquet(df: pd.DataFrame, directory=PARQUET_DIR):
+    """Writes the scored works as a Parquet dataset partitioned by year (`year=2004/...`).
+
+    Works without a year go to the `year=__HIVE_DEFAULT_PARTITION__` partition. The dataset is
+    written next to the previous one and swapped in, so readers never see half of it.
+    """
+    tmp_directory = f"{directory}.tmp"
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    ds.write_dataset(works_table(df), tmp_directory, format='parquet', partitioning=PARTITIONING,
+                     basename_template='works-{i}.parquet', preserve_order=True)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_directory, directory)
+
+def read_parquet(columns=None, years=None, directory=PARQUET_DIR) -> pd.DataFrame:
+    """Loads works from the Parquet dataset, reading only the given columns and year partitions."""
+    dataset = ds.dataset(directory, format='parquet', partitioning=PARTITIONING)
+    expression = ds.field('year').isin(list(years)) if years is not None else None
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
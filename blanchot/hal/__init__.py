@@ -1,75 +1,177 @@
-import requests, time
-from collections import defaultdict
+import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from tqdm import tqdm
-from pydantic import ValidationError
 
-from .models import HALWorkModel
+from archive import RawArchive, iter_archived_pages
+from checkpoint import Checkpoint
+from paging import PageValidator
+from transport import get_json
+
+from .models import HALWorkModel, HAL_FIELDS
 
 
 BASE_URL = "https://api.archives-ouvertes.fr/search/"
 SEARCH_TERM = "Maurice Blanchot"
 START_YEAR = 1998
 ROWS_PER_PAGE = 100
-OUTPUT_JSON_FILE = "hal_blanchot_data.json"
+HAL_WORKERS = 4
+# 'offset' fetches start/rows pages in parallel, 'cursor' walks Solr's cursorMark and 'auto'
+# switches to the cursor once offsets would get deep enough to slow Solr down.
+HAL_PAGING = 'auto'
+DEEP_PAGING_THRESHOLD = 10000
+ARCHIVE_NAME = 'hal'
+
+def _hal_filter(since=None):
+    """Builds the filter query, optionally limited to documents modified since a date (a delta harvest)."""
+    filter_query = f'publicationDateY_i:[{START_YEAR} TO *]'
+    if since:
+        filter_query += f' AND modifiedDate_tdate:[{since}T00:00:00Z TO *]'
+    return filter_query
+
+def _hal_params(since=None, **extra):
+    """Builds the query parameters shared by every HAL page request."""
+    params = {
+        'q': f'(title_t:"{SEARCH_TERM}" OR abstract_t:"{SEARCH_TERM}")',
+        'fq': _hal_filter(since),
+        'fl': ','.join(HAL_FIELDS),
+        'wt': 'json',
+        'rows': ROWS_PER_PAGE,
+        'sort': 'docid asc'
+    }
+    params.update(extra)
+    return params
+
+def _fetch_hal_page(start, since=None):
+    """Fetches one page of HAL results starting at the given offset."""
+    data = get_json(BASE_URL, _hal_params(since, start=start))
+    return data.get('response', {}).get('docs', [])
 
-def get_hal_work():
-    validated_works = []
-    failed_works_log = []
-    start = 0
+def iter_hal_cursor_pages(cursor_mark='*', since=None):
+    """Walks HAL with Solr's cursorMark, yielding (docs, next_cursor_mark) for every page.
+
+    Unlike start offsets, a cursor keeps per-page latency flat however deep the result set goes.
+    Passing a cursor_mark saved from an earlier page resumes the walk right after that page.
+    """
+    while True:
+        data = get_json(BASE_URL, _hal_params(since, cursorMark=cursor_mark))
+        docs = data.get('response', {}).get('docs', [])
+        next_cursor_mark = data.get('nextCursorMark', cursor_mark)
+        if docs:
+            yield docs, next_cursor_mark
+        if not docs or next_cursor_mark == cursor_mark:
+            return
+        cursor_mark = next_cursor_mark
+
+def _iter_hal_offset_pages(num_found, max_workers, since=None, first_start=0):
+    """Fetches start/rows pages in parallel and yields them back in offset order.
+
+    Only 2 * max_workers pages are requested ahead of the one being consumed, so a slow consumer
+    never has the whole result set waiting in memory. Pages come out in the same
+    (docs, cursor_mark) shape as the cursor walk, with no cursor.
+    """
+    offsets = iter(range(first_start, num_found, ROWS_PER_PAGE))
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hal')
+    futures = deque()
+    try:
+        for start in offsets:
+            futures.append(executor.submit(_fetch_hal_page, start, since))
+            if len(futures) >= 2 * max_workers:
+                yield futures.popleft().result(), None
+        while futures:
+            yield futures.popleft().result(), None
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+def _validator():
+    return PageValidator(HALWorkModel, key='docid', raw_key='uri_s')
+
+def iter_hal_work(max_workers=HAL_WORKERS, paging=HAL_PAGING, cursor_mark='*', since=None):
+    """Harvests HAL, yielding validated, deduplicated documents one page at a time.
+
+    Only the docids already yielded are kept, to drop documents seen in an earlier page.
+    """
+    validator = _validator()
+    downloaded = 0
     num_found = 0
 
     print("Querying HAL API to get total number of results...")
     specific_query = f'(title_t:"{SEARCH_TERM}" OR abstract_t:"{SEARCH_TERM}")'
-    initial_params = {'q': specific_query, 'fq': f'publicationDateY_i:[{START_YEAR} TO *]', 'rows': 0}
+    initial_params = {'q': specific_query, 'fq': _hal_filter(since), 'rows': 0}
     try:
-        initial_resp = requests.get(BASE_URL, params=initial_params).json()
+        initial_resp = get_json(BASE_URL, initial_params)
         num_found = initial_resp.get('response', {}).get('numFound', 0)
         print(f"Found {num_found} total works to download.")
     except requests.exceptions.RequestException as e:
+        # Failing here would otherwise look like an empty result set.
         print(f"Initial API request failed: {e}")
-        num_found = 0
+        raise
+
+    if paging == 'auto':
+        paging = 'cursor' if num_found > DEEP_PAGING_THRESHOLD else 'offset'
 
     if num_found > 0:
-        with tqdm(total=num_found, desc="Downloading works from HAL") as pbar:
-            while start < num_found:
-                params = {
-                    'q': f'(title_t:"{SEARCH_TERM}" OR abstract_t:"{SEARCH_TERM}")',
-                    'fq': f'publicationDateY_i:[{START_YEAR} TO *]',
-                    'fl': 'title_s, authFullName_s, publicationDateY_i, journalTitle_s, uri_s, docType_s, docid',
-                    'wt': 'json',
-                    'rows': ROWS_PER_PAGE,
-                    'start': start,
-                    'sort': 'docid asc'
-                }
+        # Every page is checkpointed, so a restarted run resumes after the last page it saved.
+        checkpoint = Checkpoint(f"hal {paging} {_hal_filter(since)}")
+        saved_docs, state = checkpoint.load()
+        next_start = state.get('start', 0)
+        if cursor_mark == '*':
+            cursor_mark = state.get('cursor_mark', cursor_mark)
+
+        if paging == 'cursor':
+            pages = iter_hal_cursor_pages(cursor_mark, since)
+        else:
+            # The total is known up front, so page offsets can be requested ahead in parallel.
+            # Pages come back in offset order, which keeps the output in `docid asc` order.
+            pages = _iter_hal_offset_pages(num_found, max_workers, since, next_start)
+
+        archive = RawArchive(ARCHIVE_NAME, since)
+        with tqdm(total=num_found, initial=len(saved_docs), desc="Downloading works from HAL") as pbar:
+            downloaded = len(saved_docs)
+            if saved_docs:
+                archive.write(saved_docs)
+                yield validator.new_records(validator.validate(saved_docs))
+            while True:
                 try:
-                    response = requests.get(BASE_URL, params=params)
-                    response.raise_for_status()
-                    data = response.json()
-                    docs = data.get('response', {}).get('docs', [])
-                    if not docs: break
-                    for doc_data in docs:
-                        try:
-                            validated_work = HALWorkModel.model_validate(doc_data)
-                            validated_works.append(validated_work.model_dump())
-                        except ValidationError as e:
-                            failed_works_log.append({"uri": doc_data.get("uri_s"), "error_details": e.errors()})
-                    pbar.update(len(docs))
-                    start += ROWS_PER_PAGE
-                    time.sleep(0.1)
+                    docs, next_cursor_mark = next(pages)
+                except StopIteration:
+                    break
                 except requests.exceptions.RequestException as e:
-                    print(f"\nAn error occurred during download: {e}"); break
-    
-    original_count = len(validated_works)
-    print(f"\nPerforming deduplication on {original_count} records...")
-
-    grouped_by_docid = defaultdict(list)
-    for work in validated_works:
-        grouped_by_docid[work['docid']].append(work)
+                    # A HAL page failed even after the transport's retries. Skipping it would
+                    # leave a gap in the docid order, so the harvest stops at the last saved page.
+                    print(f"\nAn error occurred during download: {e}")
+                    print(f"Progress is checkpointed; the next run resumes after {downloaded} works.")
+                    pages.close()
+                    raise
+                if not docs: break
+                downloaded += len(docs)
+                pbar.update(len(docs))
+                if paging == 'cursor':
+                    cursor_mark = next_cursor_mark or cursor_mark
+                    checkpoint.save(docs, cursor_mark=cursor_mark)
+                else:
+                    next_start += ROWS_PER_PAGE
+                    checkpoint.save(docs, start=next_start)
+                archive.write(docs)
+                yield validator.new_records(validator.validate(docs))
+        pages.close()
+        archive.close()
+        checkpoint.clear()
+    else:
+        # An empty harvest is archived too, or a replay would fall back on an older full one.
+        RawArchive(ARCHIVE_NAME, since).close()
 
-    validated_works = [works_list[0] for works_list in grouped_by_docid.values()]
-    final_count = len(validated_works)
+    validator.report()
+    print(f"\nDownloaded {downloaded} records; kept {len(validator.seen)} unique ones.")
 
-    print(f"Removed {original_count - final_count} duplicate records.")
+def replay_hal_work():
+    """Rebuilds the HAL documents from the raw-record archive, without touching the network."""
+    validator = _validator()
+    for docs in iter_archived_pages(ARCHIVE_NAME, key='docid'):
+        yield validator.new_records(validator.validate(docs))
+    print(f"\nReplayed {len(validator.seen)} archived HAL documents.")
 
-    return validated_works
\ No newline at end of file
+def get_hal_work(max_workers=HAL_WORKERS, paging=HAL_PAGING, cursor_mark='*', since=None):
+    """Harvests HAL into a single list of validated, deduplicated documents."""
+    return [work for page in iter_hal_work(max_workers, paging, cursor_mark, since) for work in page]
@@ -1,12 +1,21 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 from pydantic import BaseModel, HttpUrl
 
+# Fields read by from_hal_to_blanchotwork, plus docid for deduplication; get_hal_work() requests only these.
+HAL_FIELDS = [
+    'docid', 'title_s', 'authFullName_s', 'publicationDateY_i', 'publicationDate_s',
+    'journalTitle_s', 'uri_s', 'docType_s', 'doiId_s', 'language_s', 'openAccess_bool',
+]
+
 class HALWorkModel(BaseModel):
+    docid: Union[int, str]
     title_s: List[str]
     docType_s: str
     uri_s: HttpUrl
     authFullName_s: Optional[List[str]] = None
     publicationDateY_i: Optional[int] = None
+    publicationDate_s: Optional[str] = None
     journalTitle_s: Optional[str] = None
-    class Config:
-        extra = 'allow'
\ No newline at end of file
+    doiId_s: Optional[str] = None
+    language_s: Optional[List[str]] = None
+    openAccess_bool: Optional[bool] = None
\ No newline at end of file
@@ -0,0 +1,124 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+_DONE = object()
+
+
+def iter_concurrently(producers, max_workers, thread_name_prefix='stream', max_pending=None):
+    """Runs several generators on a thread pool and yields their items as they arrive.
+
+    `producers` are zero-argument callables returning iterators (one per shard). At most
+    `max_pending` items wait to be consumed, so when the consumer falls behind the producers
+    block instead of piling pages up in memory. An exception in a producer is re-raised here;
+    closing the stream early stops the producers after the item they are working on.
+    """
+    producers = list(producers)
+    pending = queue.Queue(maxsize=max_pending or 2 * max_workers)
+    stopped = threading.Event()
+
+    def _put(item):
+        while not stopped.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _drain(producer):
+        try:
+            for item in producer():
+                if not _put((item, None)):
+                    return
+        except BaseException as e:
+            _put((_DONE, e))
+        else:
+            _put((_DONE, None))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+    for producer in producers:
+        executor.submit(_drain, producer)
+    remaining = len(producers)
+    try:
+        while remaining:
+            item, error = pending.get()
+            if item is not _DONE:
+                yield item
+            elif error is not None:
+                raise error
+            else:
+                remaining -= 1
+    finally:
+        stopped.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+class Prefilter:
+    """Screens translated records as they stream in, before any DataFrame is built.
+
+    Records for which `keep` is false are set aside in `pending` rather than returned, so they
+    skip the combine stage unless it asks for them back. Pages are screened from several threads.
+    """
+
+    def __init__(self, keep):
+        self.keep = keep
+        self.pending = []
+        self._lock = threading.Lock()
+
+    def screen(self, records):
+        """Returns the records to keep, setting the others aside."""
+        kept, pending = [], []
+        for record in records:
+            (kept if self.keep(record) else pending).append(record)
+        if pending:
+            with self._lock:
+                self.pending.extend(pending)
+        return kept
+
+    def rescreen(self):
+        """Screens the set-aside records again, after they gained fields, returning those that now pass."""
+        with self._lock:
+            pending, self.pending = self.pending, []
+        return self.screen(pending)
+
+
+def _run_source(name, fetch, translate, fetch_kwargs, prefilter=None):
+    """Consumes one source's page stream, translating each page into our standard format as it arrives."""
+    started = time.perf_counter()
+    records = []
+    screened_out = 0
+    for page in fetch(**fetch_kwargs):
+        translated = [translate(work) for work in page]
+        if prefilter is not None:
+            kept = prefilter.screen(translated)
+            screened_out += len(translated) - len(kept)
+            translated = kept
+        records.extend(translated)
+    elapsed = time.perf_counter() - started
+    print(f"\n[{name}] {len(records)} records harvested in {elapsed:.1f}s"
+          + (f" ({screened_out} set aside by the pre-filter)" if screened_out else ""))
+    return records
+
+
+def harvest_sources(sources, prefilter=None):
+    """Runs every source harvester at the same time and returns their records for the combine stage.
+
+    `sources` is a list of (name, fetch, translate, fetch_kwargs) tuples, where `fetch` is one of
+    the iter_*_work generators yielding validated pages. Each source gets its own thread, and its
+    concurrency budget is passed to its fetcher through `fetch_kwargs`, so a slow source never
+    holds up the others. Pages are translated, and screened by the optional Prefilter, as they
+    arrive, so only the translated records are ever held in full. Results come back in the
+    order the sources were given, which keeps the combine stage deterministic.
+    """
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='harvest') as executor:
+        futures = [
+            (name, executor.submit(_run_source, name, fetch, translate, fetch_kwargs, prefilter))
+            for name, fetch, translate, fetch_kwargs in sources
+        ]
+        results = {name: future.result() for name, future in futures}
+
+    print(f"\nAll sources harvested in {time.perf_counter() - started:.1f}s")
+    return results
@@ -1,89 +1,163 @@
-import re
+import os
 import time
 import urllib.parse
-from collections import defaultdict
+from functools import partial
 
 import requests
-from pydantic import ValidationError
-from tqdm import tqdm
 
-from .models import OpenAlexWork
+from archive import RawArchive, iter_archived_pages
+from checkpoint import Checkpoint
+from harvest import iter_concurrently
+from paging import PageValidator, Progress, iter_cursor_pages
+from transport import get_json
+
+from .models import OpenAlexWork, OPENALEX_FIELDS
+
+BASE_URL = "https://api.openalex.org/works"
+SEARCH_FILTER = "title_and_abstract.search:Blanchot"
+START_YEAR = 1998
+OA_WORKERS = 4
+PER_PAGE = 200
+# Works citing given works are found with `cites:` filters, OR-ing up to this many IDs per filter.
+CITES_BATCH_SIZE = 50
+# DOIs are looked up with `doi:` filters, this many per request (OpenAlex ORs up to 100 values).
+DOI_BATCH_SIZE = 50
+# OpenAlex only honours from_updated_date for premium API keys.
+API_KEY = os.environ.get('OPENALEX_API_KEY')
+ARCHIVE_NAME = 'openalex'
+
+def _validator():
+    # Works are deduplicated on their short ID; a work whose ID has none is invalid.
+    return PageValidator(OpenAlexWork, key='short_id', raw_key='id')
+
+def _tag_cited_works(records, cited_works):
+    """Tags each record with the works among `cited_works` (short IDs) that it references."""
+    for record in records:
+        references = {reference.rsplit('/', 1)[-1] for reference in record.referenced_works}
+        record.cited_key_works = sorted(references & cited_works)
+    return records
+
+def _cites_filters(cited_works):
+    """Builds the `cites:` filters for works citing any of `cited_works`, CITES_BATCH_SIZE IDs at a time."""
+    ids = sorted(cited_works)
+    return [f"cites:{'|'.join(ids[i:i + CITES_BATCH_SIZE])}" for i in range(0, len(ids), CITES_BATCH_SIZE)]
+
+def _fetch_page(filters, cursor):
+    """Fetches the page of works at `cursor`, returning (raw works, next cursor, total).
+
+    OpenAlex answers a bad request with an error status, which get_json() raises as an HTTPError.
+    """
+    select = ','.join(OPENALEX_FIELDS)
+    url = (f"{BASE_URL}?filter={urllib.parse.quote(filters)}&select={select}"
+           f"&per_page={PER_PAGE}&cursor={urllib.parse.quote(cursor)}")
+    if API_KEY:
+        url += f"&api_key={API_KEY}"
+    resp = get_json(url)
+    meta = resp.get('meta', {})
+    return resp.get('results', []), meta.get('next_cursor'), meta.get('count', 0)
+
+def _harvest_filter(filters, progress, validator, archive):
+    """Walks one cursor over the given filter, yielding a list of valid records for every page.
+
+    Raw pages go to the archive. Every page is checkpointed, so a restarted run picks the cursor
+    up where this one stopped and skips shards that had already finished. iter_oa_work() clears
+    the checkpoints once every shard is done. A failed request aborts the harvest, after
+    iter_cursor_pages() logs the shard's filter: skipping the shard would silently drop its works
+    from data.csv, and the next run resumes it from its checkpoint instead.
+    """
+    checkpoint = Checkpoint(f"openalex {filters}")
+    for works in iter_cursor_pages(checkpoint, partial(_fetch_page, filters), progress, filters):
+        archive.write(works)
+        yield validator.validate(works)
+
+def iter_oa_work(max_workers=OA_WORKERS, sharded=True, since=None, cited_works=None):
+    """Harvests OpenAlex, yielding validated, deduplicated records one page at a time.
+
+    Besides the text search, works citing any of `cited_works` (short IDs) are harvested with
+    `cites:` filters, paged alongside the search shards, and every record is tagged with the
+    cited works it references. Only the short IDs already yielded are kept, to drop works seen
+    in an earlier page.
+    """
+    validator = _validator()
+    cited_works = set(cited_works or ())
 
-def get_oa_work():
-    BASE_URL = "https://api.openalex.org/works"
-    records = []
-    invalid_works = []
-    
     current_year = time.localtime().tm_year
-    filters = f"title_and_abstract.search:Blanchot,publication_year:1998-{current_year}"
-    per_page = 200
-    cursor = "*"
-
-    with tqdm(desc='Downloading', unit='work') as pbar:
-        while True:
-            encoded_filters = urllib.parse.quote(filters)
-            encoded_cursor = urllib.parse.quote(cursor)
-            url = f"{BASE_URL}?filter={encoded_filters}&per_page={per_page}&cursor={encoded_cursor}"
-            
-            try:
-                resp = requests.get(url).json()
-
-                if 'error' in resp:
-                    print(f"\n--- OpenAlex API Error ---")
-                    print(f"Error: {resp.get('error')}")
-                    print(f"Message: {resp.get('message', 'No message provided.')}")
-                    break
-
-                if pbar.total is None: 
-                    pbar.total = resp.get('meta', {}).get('count', 0)
-                
-                works = resp.get('results', [])
-                if not works:
-                    break
-
-                for work in works:
-                    try:
-                        valid_work = OpenAlexWork.model_validate(work).model_dump()
-                        valid_work['short_id'] = re.search(r'[A-Z]\d+', str(valid_work['id'])).group()
-                        records.append(valid_work)
-                    except ValidationError as e:
-                        invalid_works.append({
-                            "work_id": work.get("id"),
-                            "error": str(e)
-                        })
-                    except AttributeError:
-                        invalid_works.append({
-                            "work_id": work.get("id", "N/A"),
-                            "error": "Could not parse short_id from work ID."
-                        })
-                
-                pbar.update(len(works))
-                
-                next_cursor = resp.get('meta', {}).get('next_cursor')
-                if not next_cursor:
-                    break
-                
-                cursor = next_cursor
-                time.sleep(0.1)
-
-            except requests.exceptions.RequestException as e:
-                print(f"\nA network error occurred: {e}")
-                break
-
-    if invalid_works:
-        print(f"\nSkipped {len(invalid_works)} invalid records.")
-
-    original_count = len(records)
+    searches = [SEARCH_FILTER] + _cites_filters(cited_works)
+    if sharded:
+        # One cursor per search and publication year, so up to max_workers requests are in flight at once.
+        shards = [f"{search},publication_year:{year}" for search in searches
+                  for year in range(START_YEAR, current_year + 1)]
+    else:
+        shards = [f"{search},publication_year:{START_YEAR}-{current_year}" for search in searches]
+    if since and API_KEY:
+        # Only works created or updated since the last run (a delta harvest).
+        shards = [f"{filters},from_updated_date:{since}" for filters in shards]
+    elif since:
+        print("No OPENALEX_API_KEY set, so OpenAlex cannot filter by update date; harvesting it in full.")
+
+    original_count = 0
+    citing_count = 0
+    archive = RawArchive(ARCHIVE_NAME, since if API_KEY else None)
+    with Progress(desc='Downloading', unit='work') as progress:
+        # Pages arrive in whatever order the shards deliver them, up to max_workers shards at once.
+        pages = iter_concurrently(
+            [partial(_harvest_filter, filters, progress, validator, archive) for filters in shards],
+            max_workers, thread_name_prefix='openalex'
+        )
+        for page in pages:
+            original_count += len(page)
+            records = _tag_cited_works(validator.new_records(page), cited_works)
+            citing_count += sum(1 for record in records if record.cited_key_works)
+            yield records
+    archive.close()
+    for filters in shards:
+        Checkpoint(f"openalex {filters}").clear()
+
+    validator.report()
+
     print(f"\nDownloaded: {original_count}")
+    print(f"Duplicates removed: {original_count - len(validator.seen)}")
+    if cited_works:
+        print(f"Works citing one of the {len(cited_works)} requested works: {citing_count}")
 
-    grouped_records = defaultdict(list)
-    for record in records:
-        record_id = record['short_id']
-        grouped_records[record_id].append(record)
+def _fetch_doi_batch(dois):
+    """Looks one batch of DOIs up with a single `doi:a|b|c` filter request, yielding (dois, raw works).
+
+    Yields nothing if OpenAlex rejects the request.
+    """
+    select = ','.join(OPENALEX_FIELDS)
+    filters = urllib.parse.quote(f"doi:{'|'.join(dois)}")
+    # A DOI can belong to more than one OpenAlex work, so leave room for a few extra results.
+    url = f"{BASE_URL}?filter={filters}&select={select}&per_page={PER_PAGE}"
+    if API_KEY:
+        url += f"&api_key={API_KEY}"
+    try:
+        resp = get_json(url)
+    except requests.HTTPError as e:
+        # A rejected batch (a malformed DOI, say) is skipped and left uncached, not fatal.
+        print(f"\nOpenAlex DOI lookup failed for a batch of {len(dois)} DOIs, skipping it: {e}")
+        return
+    yield dois, resp.get('results', [])
+
+def iter_oa_works_by_doi(dois, max_workers=OA_WORKERS):
+    """Looks DOIs up in OpenAlex DOI_BATCH_SIZE at a time, yielding (dois, raw works) per batch.
 
-    records = [works_list[0] for works_list in grouped_records.values()]
-    final_count = len(records)
+    Batches are requested up to max_workers at a time and come back in whatever order they finish.
+    DOIs that cannot be put in a filter (they contain ',' or '|') are skipped.
+    """
+    dois = [doi for doi in dois if ',' not in doi and '|' not in doi]
+    batches = [dois[i:i + DOI_BATCH_SIZE] for i in range(0, len(dois), DOI_BATCH_SIZE)]
+    yield from iter_concurrently([partial(_fetch_doi_batch, batch) for batch in batches],
+                                 max_workers, thread_name_prefix='openalex-doi')
 
-    print(f"Duplicates removed: {original_count - final_count}")
+def replay_oa_work(cited_works=None):
+    """Rebuilds the OpenAlex records from the raw-record archive, without touching the network."""
+    validator = _validator()
+    cited_works = set(cited_works or ())
+    for works in iter_archived_pages(ARCHIVE_NAME, key='id'):
+        yield _tag_cited_works(validator.new_records(validator.validate(works)), cited_works)
+    print(f"\nReplayed {len(validator.seen)} archived OpenAlex works.")
 
-    return records
\ No newline at end of file
+def get_oa_work(max_workers=OA_WORKERS, sharded=True, since=None, cited_works=None):
+    """Harvests OpenAlex into a single list of validated, deduplicated records."""
+    return [record for page in iter_oa_work(max_workers, sharded, since, cited_works) for record in page]
@@ -1,12 +1,18 @@
 import re
-from typing import Optional, Literal, List, Dict
+from typing import Annotated, Optional, Literal, List, Dict
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, SkipValidation, StringConstraints
 
-class Affiliation(BaseModel):
-    raw_affiliation_string: str
-    institution_ids: list[str]
+# Root-level fields read by from_openalex_to_blanchotwork; get_oa_work() selects only these.
+OPENALEX_FIELDS = [
+    'id', 'doi', 'title', 'authorships', 'concepts', 'primary_location', 'open_access',
+    'type', 'publication_date', 'publication_year', 'language', 'cited_by_count',
+    'referenced_works', 'abstract_inverted_index',
+]
 
+# Checked by pydantic-core's regex engine, without a Python call per ISSN.
+ISSN = Annotated[str, StringConstraints(pattern=r'^\d{4}-\d{3}[\dX]$')]
+SHORT_ID_PATTERN = re.compile(r'[A-Z]\d+')
 
 class DehydratedAuthor(BaseModel):
     id: str
@@ -14,46 +20,19 @@ class DehydratedAuthor(BaseModel):
     orcid: Optional[str] = None
 
 
-class Institution(BaseModel):
-    id: str
-    display_name: str
-    ror: str
-    country_code: Optional[str]
-    type: str
-    lineage: list[str]
-
-
-class Authorship(BaseModel):
-    model_config = ConfigDict(extra='allow')
-    affiliations: list[Affiliation]
+class AuthorshipSummary(BaseModel):
+    # Only the author is translated, so the affiliation/institution trees are skipped, not validated.
     author: DehydratedAuthor
-    author_position: Optional[Literal['first', 'middle', 'last']] = None
-
-
-    countries: list[str]
-    institutions: list[Institution]
-    is_corresponding: Optional[bool] = None
 
 
 class DehydratedSource(BaseModel):
     id: str
     display_name: str
-    issn_l: Optional[str] = Field(pattern=r'^\d{4}-\d{3}[\dX]$')
-    issn: Optional[list[str]]
+    issn_l: Optional[ISSN]
+    issn: Optional[list[ISSN]]
     host_organization: Optional[str]
     type: Literal['journal', 'repository', 'conference', 'ebook platform', 'book series', 'metadata', 'other']
 
-    # TODO: figure out how to validate
-    @model_validator(mode='after')
-    def validate_issn(self):
-        issn_pattern = r'^\d{4}-\d{3}[\dX]$'
-        
-        if self.issn is not None:
-            for id in self.issn:
-                if not re.fullmatch(issn_pattern, id):
-                    raise ValueError("Issn(s) formatted incorrectly")
-        return self
-
 
 class Location(BaseModel):
     is_oa: bool
@@ -66,15 +45,24 @@ class Location(BaseModel):
     is_published: bool
 
 
+class ConceptSummary(BaseModel):
+    display_name: Optional[str] = None
+
+
+class OpenAccess(BaseModel):
+    is_oa: Optional[bool] = None
+
+
 #Top Level Model:
 class OpenAlexWork(BaseModel):
     id: str
     doi: Optional[str] = None
     title: Optional[str]
     
-    authorships: List[Authorship]
+    authorships: List[AuthorshipSummary]
+    concepts: List[ConceptSummary] = []
     primary_location: Optional[Location] = None
-    locations: List[Location]
+    open_access: Optional[OpenAccess] = None
 
     type: str
     publication_date: str
@@ -84,8 +72,15 @@ class OpenAlexWork(BaseModel):
     cited_by_count: int
     referenced_works: List[str]
 
-    abstract_inverted_index: Optional[Dict[str, List[int]]] = None
-    
-    
-    class Config:
-        extra = 'allow'
\ No newline at end of file
+    # The biggest field by far: checking every position list cost more than the rest of the work,
+    # and only reconstruct_abstract() reads it, so it is passed through as OpenAlex sent it.
+    abstract_inverted_index: SkipValidation[Optional[Dict[str, List[int]]]] = None
+
+    # Not an OpenAlex field: the harvester tags each work with the requested works it cites.
+    cited_key_works: List[str] = []
+
+    @property
+    def short_id(self) -> Optional[str]:
+        """The work's OpenAlex ID without the URL prefix, e.g. W2037583803."""
+        match = SHORT_ID_PATTERN.search(self.id)
+        return match.group() if match else None
\ No newline at end of file
@@ -0,0 +1,124 @@
+import threading
+from typing import List
+
+import requests
+from pydantic import TypeAdapter, ValidationError
+from tqdm import tqdm
+
+
+class Progress:
+    """A tqdm progress bar that several shard threads add their totals and pages to."""
+
+    def __init__(self, **tqdm_kwargs):
+        self.bar = tqdm(**tqdm_kwargs)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.bar.close()
+
+    def add_total(self, total):
+        with self._lock:
+            self.bar.total = (self.bar.total or 0) + total
+            self.bar.refresh()
+
+    def update(self, count):
+        with self._lock:
+            self.bar.update(count)
+
+
+class PageValidator:
+    """Validates pages of raw API records into a source's model and drops records seen before.
+
+    A page is validated in one call into pydantic-core, and again one record at a time only if
+    it holds an invalid record, to keep the valid ones. Invalid records and records without a
+    `key` are logged in `failed`, by their `raw_key` field. Pages may be validated from several
+    threads; new_records() is called from the one consuming them.
+    """
+
+    def __init__(self, model, key, raw_key):
+        self.model = model
+        self.key = key
+        self.raw_key = raw_key
+        self.failed = []
+        # The keys of the records new_records() has returned.
+        self.seen = set()
+        self._adapter = TypeAdapter(List[model])
+
+    def validate(self, page) -> list:
+        """Returns the valid records of a page of raw records, as model instances."""
+        try:
+            records = self._adapter.validate_python(page)
+        except ValidationError:
+            records = []
+            for raw in page:
+                try:
+                    records.append(self.model.model_validate(raw))
+                except ValidationError as e:
+                    self.failed.append({'id': raw.get(self.raw_key), 'error': str(e)})
+        valid = [record for record in records if getattr(record, self.key) is not None]
+        if len(valid) < len(records):
+            self.failed.extend({'id': getattr(record, self.raw_key, None), 'error': f"No {self.key}."}
+                               for record in records if getattr(record, self.key) is None)
+        return valid
+
+    def new_records(self, records) -> list:
+        """Returns the validated records whose key has not been seen in an earlier page."""
+        new_records = []
+        for record in records:
+            key = getattr(record, self.key)
+            if key not in self.seen:
+                self.seen.add(key)
+                new_records.append(record)
+        return new_records
+
+    def report(self):
+        if self.failed:
+            print(f"\nSkipped {len(self.failed)} invalid records.")
+
+
+def iter_cursor_pages(checkpoint, fetch_page, progress, label, restart=None):
+    """Walks one cursor of a cursor-paged API, yielding every page of raw records.
+
+    `fetch_page(cursor)` returns (records, next cursor, total results); the walk ends at a page
+    without records or without a next cursor. Every page is checkpointed with the cursor after
+    it, so a restarted run first yields the pages the checkpoint holds and carries on from
+    there, or stops if the walk had finished. `restart(saved_records, state)` may return another
+    cursor to carry on from, when the saved one can no longer be used. The caller clears the
+    checkpoint once every walk of its harvest is done.
+    """
+    saved, state = checkpoint.load()
+    cursor = state.get('cursor', '*')
+    if saved:
+        progress.add_total(state.get('total', 0))
+        progress.update(len(saved))
+        if cursor and restart is not None:
+            cursor = restart(saved, state)
+        yield saved
+    counted = bool(saved)
+
+    while cursor:
+        try:
+            records, next_cursor, total = fetch_page(cursor)
+        except requests.exceptions.RequestException as e:
+            # The transport has exhausted its retries, or the API rejected the request; stop the
+            # run rather than return a truncated dataset. The checkpoint lets the next run resume
+            # from this page.
+            print(f"\nA request failed ({label}): {e}")
+            raise
+
+        total = state.setdefault('total', total)
+        if not counted:
+            progress.add_total(total)
+            counted = True
+        if not records:
+            break
+        progress.update(len(records))
+
+        cursor = next_cursor
+        checkpoint.save(records, cursor=cursor, total=total)
+        yield records
+
+    checkpoint.save([], cursor=None, total=state.get('total', 0))
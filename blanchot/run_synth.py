@@ -356,17 +356,33 @@
 
 #END V1-----------------------------------------------------------------------------------------------------
 
+import argparse
 import os
 import time
 import warnings
-from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from functools import partial
+from typing import List, Optional, Dict, Any, Tuple, Union
 
+import numpy as np
 import pandas as pd
-from pydantic import BaseModel, HttpUrl, ValidationError
-
-from hal import get_hal_work
-from openalex import get_oa_work
-from cr import get_cr_work
+from pydantic import ValidationError
+
+from hal import iter_hal_work, replay_hal_work, HAL_WORKERS
+from hal.models import HALWorkModel
+from openalex import iter_oa_work, replay_oa_work, OA_WORKERS
+from openalex.models import OpenAlexWork
+from cr import iter_cr_work, replay_cr_work, CR_WORKERS
+from cr.models import CrossrefWorkModel
+from harvest import Prefilter, harvest_sources
+from citations import CitationGraph, SIGNAL_COLUMNS
+from dedup import near_duplicate_labels
+from enrich import normalize_doi, resolve_dois
+from export import write_parquet, PARQUET_DIR
+from seeds import load_seed_index
+from store import WorkStore, STORE_FILE
+import delta
 
 # A set of OpenAlex IDs for Maurice Blanchot's major works for citation analysis
 BLANCHOT_KEY_WORKS = {
@@ -377,23 +393,50 @@ BLANCHOT_KEY_WORKS = {
     'W2001021422'   # Le Livre à venir (The Book to Come)
 }
 
+# Works scoring below this are pruned from the output.
+RELEVANCE_THRESHOLD = 8
+# Reconstructed OpenAlex abstracts are memoized by work ID, up to this many (0 disables the memo).
+ABSTRACT_MEMO_SIZE = 10000
+_abstract_memo = OrderedDict()
+
 # Ignore all FutureWarnings to keep the console output clean
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
 
-# --- Pydantic Models: Define the Standardized Data Structure ---
+# --- Standardized Data Structure ---
+# Source records are validated by each source's pydantic models, so these are plain slotted
+# dataclasses: translating a record allocates one object, plus one per author.
 
-class Author(BaseModel):
-    model_config = {'from_attributes': True}
+@dataclass(slots=True)
+class Author:
     full_name: str
     given_name: Optional[str] = None
     family_name: Optional[str] = None
 
-class BlanchotWork(BaseModel):
+@dataclass(slots=True)
+class LazyAbstract:
+    """An OpenAlex abstract kept as its inverted index until its text is needed."""
+    work_id: str
+    inverted_index: Dict[str, List[int]]
+
+    def text(self) -> Optional[str]:
+        if self.work_id in _abstract_memo:
+            _abstract_memo.move_to_end(self.work_id)
+            return _abstract_memo[self.work_id]
+        text = reconstruct_abstract(self.inverted_index)
+        if ABSTRACT_MEMO_SIZE:
+            _abstract_memo[self.work_id] = text
+            if len(_abstract_memo) > ABSTRACT_MEMO_SIZE:
+                _abstract_memo.popitem(last=False)
+        return text
+
+@dataclass(slots=True, kw_only=True)
+class BlanchotWork:
+    # Fields a source does not provide stay None, and are filled from other sources in the merge.
     doi: Optional[str] = None
     title: Optional[str] = None
-    authors: List[Author] = []
-    editors: List[Author] = []
+    authors: Optional[List[Author]] = None
+    editors: Optional[List[Author]] = None
     year: Optional[int] = None
     publication_date: Optional[str] = None
     journal_name: Optional[str] = None
@@ -401,300 +444,610 @@ class BlanchotWork(BaseModel):
     work_type: Optional[str] = None
     language: Optional[str] = None
     is_open_access: Optional[bool] = None
-    abstract: Optional[str] = None
-    subjects: List[str] = []
-    source_url: Optional[HttpUrl] = None
+    abstract: Optional[Union[str, LazyAbstract]] = None
+    subjects: Optional[List[str]] = None
+    source_url: Optional[str] = None
     citation_count: Optional[int] = None
     source_db: str
     relation: Optional[Dict[str, Any]] = None
-    referenced_works: List[str] = []
+    referenced_works: Optional[List[str]] = None
+    # The BLANCHOT_KEY_WORKS a work cites, tagged by the OpenAlex harvest.
+    cited_key_works: Optional[List[str]] = None
+    # The OpenAlex ID (W123) of the work, or of the OpenAlex work it was enriched from.
+    openalex_id: Optional[str] = None
+    # The HAL docid of a HAL record.
+    hal_id: Optional[str] = None
+
+WORK_FIELDS = [field.name for field in fields(BlanchotWork)]
 
 
 # --- Helper Functions ---
 
 def reconstruct_abstract(inverted_index: Optional[Dict[str, List[int]]]) -> Optional[str]:
-    """Reconstructs a plain-text abstract from an OpenAlex inverted index."""
+    """Reconstructs a plain-text abstract from an OpenAlex inverted index.
+
+    Every word is placed straight at its positions in a position-indexed list, so this is linear
+    in the length of the abstract, with no sort. Unused positions are skipped.
+    """
     if not inverted_index:
         return None
-    word_positions = []
+    size = 1 + max((max(positions) for positions in inverted_index.values() if positions), default=-1)
+    words = [None] * size
     for word, positions in inverted_index.items():
-        for pos in positions:
-            word_positions.append((pos, word))
-    word_positions.sort()
-    return ' '.join([word for pos, word in word_positions])
-
-def load_seed_titles(filepath="blanchot/seed_titles.txt") -> set:
-    """Loads a list of known-good titles from a text file."""
-    try:
-        with open(filepath, 'r') as f:
-            # Read titles, strip whitespace, and convert to lowercase for matching
-            return {line.strip().lower() for line in f}
-    except FileNotFoundError:
-        print(f"Warning: Seed titles file not found at '{filepath}'. Skipping this scoring rule.")
-        return set()
+        for position in positions:
+            words[position] = word
+    return ' '.join([word for word in words if word is not None])
+
+def abstract_text(abstract) -> Optional[str]:
+    """Returns an abstract as text, reconstructing it if it is still lazy."""
+    return abstract.text() if isinstance(abstract, LazyAbstract) else abstract
 
 # --- Translator Functions ---
 
-def from_openalex_to_blanchotwork(work_data: dict) -> dict:
-    """Translates a raw OpenAlex dictionary into our standard format."""
-    authors = [Author(full_name=auth.get('author', {}).get('display_name', '')) for auth in work_data.get('authorships', [])]
-    subjects = [concept.get('display_name') for concept in work_data.get('concepts', []) if concept]
-    
+def from_openalex_to_blanchotwork(work: OpenAlexWork) -> BlanchotWork:
+    """Translates a validated OpenAlex work into our standard format."""
     journal = None
-    if primary_loc := work_data.get('primary_location'):
-        if source := primary_loc.get('source'):
-            journal = source.get('display_name')
-
-    return {
-        'doi': work_data.get('doi'),
-        'title': work_data.get('title'),
-        'authors': authors,
-        'year': work_data.get('publication_year'),
-        'publication_date': work_data.get('publication_date'),
-        'journal_name': journal,
-        'publisher': work_data.get('publisher'),
-        'work_type': work_data.get('type'),
-        'language': work_data.get('language'),
-        'is_open_access': work_data.get('is_oa'),
-        'abstract': reconstruct_abstract(work_data.get('abstract_inverted_index')),
-        'subjects': subjects,
-        'citation_count': work_data.get('cited_by_count'),
-        'source_url': work_data.get('id'),
-        'source_db': 'OpenAlex',
-        'relation': None,
-        'referenced_works': work_data.get('referenced_works', [])
-    }
-
-def from_crossref_to_blanchotwork(work_data: dict) -> dict:
-    """Translates a raw Crossref dictionary into our standard format."""
-    authors = []
-    author_data = work_data.get('author')
-    if isinstance(author_data, list):
-        for author_info in author_data:
-            given = author_info.get('given', '')
-            family = author_info.get('family', '')
-            authors.append(Author(
-                full_name=f"{given} {family}".strip(),
-                given_name=given,
-                family_name=family
-            ))
-            
-    editors = []
-    editor_data = work_data.get('editor')
-    if isinstance(editor_data, list):
-        for editor_info in editor_data:
-            given = editor_info.get('given', '')
-            family = editor_info.get('family', '')
-            editors.append(Author(
-                full_name=f"{given} {family}".strip(),
-                given_name=given,
-                family_name=family
-            ))
-        
+    if work.primary_location and work.primary_location.source:
+        journal = work.primary_location.source.display_name
+
+    return BlanchotWork(
+        doi=work.doi,
+        title=work.title,
+        authors=[Author(authorship.author.display_name) for authorship in work.authorships],
+        year=work.publication_year,
+        publication_date=work.publication_date,
+        journal_name=journal,
+        # No publisher: OpenAlex has none on the work itself, and Crossref supplies it in the merge.
+        work_type=work.type,
+        language=work.language,
+        is_open_access=work.open_access.is_oa if work.open_access else None,
+        abstract=LazyAbstract(work.id, work.abstract_inverted_index) if work.abstract_inverted_index else None,
+        # Concepts may come without a name, which would break joining and sorting the subjects.
+        subjects=[concept.display_name for concept in work.concepts if concept.display_name is not None],
+        citation_count=work.cited_by_count,
+        source_url=work.id,
+        source_db='OpenAlex',
+        referenced_works=work.referenced_works,
+        cited_key_works=work.cited_key_works,
+        openalex_id=work.short_id
+    )
+
+def _crossref_people(people) -> List[Author]:
+    """Turns Crossref author or editor entries into Authors."""
+    if not people:
+        return []
+    return [
+        Author(f"{person.given or ''} {person.family or ''}".strip(), person.given, person.family)
+        for person in people
+    ]
+
+def from_crossref_to_blanchotwork(work: CrossrefWorkModel) -> BlanchotWork:
+    """Translates a validated Crossref record into our standard format."""
     year = None
-    published = work_data.get('published-print') or work_data.get('published-online')
-    if isinstance(published, dict):
-        if date_parts := published.get('date-parts', [[]]):
-            if date_parts and date_parts[0]: 
-                year = date_parts[0][0]
-
-    journal_name = None
-    container_title = work_data.get('container-title')
-    if isinstance(container_title, list) and container_title:
-        journal_name = container_title[0]
-
-    doi = work_data.get('DOI')
-    source_url = work_data.get('URL')
-    if not source_url and doi:
-        source_url = f"https://doi.org/{doi}"
-    
-    return {
-        'doi': doi,
-        'title': (work_data.get('title') or [None])[0],
-        'authors': authors,
-        'editors': editors,
-        'year': year,
-        'publication_date': None,
-        'journal_name': journal_name,
-        'publisher': work_data.get('publisher'),
-        'work_type': work_data.get('type'),
-        'language': work_data.get('language'),
-        'is_open_access': None,
-        'subjects': work_data.get('subject', []),
-        'citation_count': work_data.get('is-referenced-by-count'),
-        'source_url': source_url,
-        'source_db': 'Crossref',
-        'relation': work_data.get('relation'),
-        'referenced_works': []
-    }
-
-def from_hal_to_blanchotwork(work_data: dict) -> dict:
-    """Translates a raw HAL dictionary into our standard format."""
-    authors = [Author(full_name=name) for name in work_data.get('authFullName_s', [])]
-
-    return {
-        'doi': work_data.get('doiId_s'),
-        'title': (work_data.get('title_s') or [None])[0],
-        'authors': authors,
-        'year': work_data.get('publicationDateY_i'),
-        'publication_date': work_data.get('publicationDate_s'),
-        'journal_name': work_data.get('journalTitle_s'),
-        'work_type': work_data.get('docType_s'),
-        'language': (work_data.get('language_s') or [None])[0],
-        'is_open_access': work_data.get('openAccess_bool'),
-        'source_db': 'HAL'
-    }
+    published = work.published_print or work.published_online
+    if published and published.date_parts and published.date_parts[0]:
+        year = published.date_parts[0][0]
+
+    return BlanchotWork(
+        doi=work.DOI,
+        title=work.title[0] if work.title else None,
+        authors=_crossref_people(work.author),
+        editors=_crossref_people(work.editor),
+        year=year,
+        journal_name=work.container_title[0] if work.container_title else None,
+        publisher=work.publisher,
+        work_type=work.type,
+        subjects=work.subject or [],
+        citation_count=work.is_referenced_by_count,
+        source_url=work.URL or f"https://doi.org/{work.DOI}",
+        source_db='Crossref',
+        relation=work.relation,
+        referenced_works=[]
+    )
+
+def from_hal_to_blanchotwork(work: HALWorkModel) -> BlanchotWork:
+    """Translates a validated HAL document into our standard format."""
+    return BlanchotWork(
+        doi=work.doiId_s,
+        title=work.title_s[0] if work.title_s else None,
+        authors=[Author(name) for name in work.authFullName_s or []],
+        year=work.publicationDateY_i,
+        publication_date=work.publicationDate_s,
+        journal_name=work.journalTitle_s,
+        work_type=work.docType_s,
+        language=work.language_s[0] if work.language_s else None,
+        is_open_access=work.openAccess_bool,
+        source_url=str(work.uri_s),
+        source_db='HAL',
+        hal_id=str(work.docid)
+    )
+
+def works_to_frame(works: List[BlanchotWork]) -> pd.DataFrame:
+    """Builds a DataFrame from translated works one column at a time, without a dict per record."""
+    return pd.DataFrame({name: [getattr(work, name) for work in works] for name in WORK_FIELDS})
+
+def from_snapshot_record(record: dict) -> dict:
+    """Restores a record saved in the delta snapshot, turning its author and lazy abstract dicts back into objects."""
+    for field in ('authors', 'editors'):
+        if isinstance(record.get(field), list):
+            record[field] = [Author(**author) for author in record[field]]
+    if isinstance(record.get('abstract'), dict):
+        record['abstract'] = LazyAbstract(**record['abstract'])
+    # Snapshots saved before unnamed OpenAlex concepts were dropped may still hold them.
+    if isinstance(record.get('subjects'), list):
+        record['subjects'] = [subject for subject in record['subjects'] if subject is not None]
+    return record
+
+
+# Fields HAL and Crossref records lack that the OpenAlex work with the same DOI can fill in.
+ENRICHED_FIELDS = ['abstract', 'referenced_works', 'cited_key_works', 'citation_count', 'subjects', 'language',
+                   'openalex_id']
+
+def _is_missing(value) -> bool:
+    return value is None or value == []
+
+def enrich_from_openalex(works: List[BlanchotWork], offline: bool = False) -> int:
+    """Fills the missing ENRICHED_FIELDS of HAL and Crossref records from OpenAlex, by DOI.
+
+    Only DOIs that no harvested OpenAlex work already carries are looked up, in batches and
+    through a persistent cache. Returns the number of records enriched.
+    """
+    harvested_dois = {normalize_doi(work.doi) for work in works if work.source_db == 'OpenAlex'}
+    targets = [(work, normalize_doi(work.doi)) for work in works if work.source_db != 'OpenAlex']
+    targets = [(work, doi) for work, doi in targets if doi and doi not in harvested_dois]
+    resolved = resolve_dois(sorted({doi for _, doi in targets}), offline=offline)
+
+    sources = {}
+    for doi, raw in resolved.items():
+        try:
+            work = OpenAlexWork.model_validate(raw)
+        except ValidationError:
+            continue
+        references = {reference.rsplit('/', 1)[-1] for reference in work.referenced_works}
+        work.cited_key_works = sorted(references & BLANCHOT_KEY_WORKS)
+        sources[doi] = from_openalex_to_blanchotwork(work)
+
+    enriched = 0
+    for work, doi in targets:
+        source = sources.get(doi)
+        if source is None:
+            continue
+        for field in ENRICHED_FIELDS:
+            if _is_missing(getattr(work, field)) and not _is_missing(getattr(source, field)):
+                setattr(work, field, getattr(source, field))
+        enriched += 1
+    print(f"Enriched {enriched} of {len(targets)} HAL and Crossref records with a DOI from OpenAlex.")
+    return enriched
 
 
 # --- Core Logic Functions ---
 
-def deduplicate_and_merge(df: pd.DataFrame) -> pd.DataFrame:
-    """Deduplicates and merges records with a robust, field-by-field strategy."""
+# Merge rules: the value of the highest-priority source that has one, the longest author list,
+# the union of list fields, open access if any source says so (unknown if none reports it) and
+# the highest citation count.
+SOURCE_PRIORITY = {'OpenAlex': 0, 'Crossref': 1, 'HAL': 2}
+FIRST_VALUE_FIELDS = ['title', 'year', 'publication_date', 'journal_name', 'publisher', 'work_type',
+                      'language', 'abstract', 'source_url', 'relation', 'openalex_id', 'hal_id']
+LONGEST_LIST_FIELDS = ['authors', 'editors']
+UNION_FIELDS = ['subjects', 'referenced_works', 'cited_key_works']
+MERGED_COLUMNS = ['doi', 'title', 'authors', 'editors', 'year', 'publication_date', 'journal_name',
+                  'publisher', 'work_type', 'language', 'is_open_access', 'abstract', 'subjects',
+                  'source_url', 'citation_count', 'relation', 'source_db', 'referenced_works',
+                  'cited_key_works', 'openalex_id', 'hal_id']
+
+def _list_length(value) -> int:
+    return len(value) if isinstance(value, list) else -1
+
+def _grouped_lists(df: pd.DataFrame, key: str, field: str) -> pd.Series:
+    """Collects `field` into one list per `key` value. `df` must be sorted by `key`."""
+    if df.empty:
+        return pd.Series([], dtype=object)
+    keys = df[key].to_numpy(dtype=object)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    chunks = np.split(df[field].to_numpy(dtype=object), starts[1:])
+    return pd.Series([chunk.tolist() for chunk in chunks], index=keys[starts], dtype=object)
+
+def _first_value_fields(key: str) -> List[str]:
+    # Groups keyed by something other than the DOI still carry a DOI column.
+    return FIRST_VALUE_FIELDS if key == 'doi' else ['doi'] + FIRST_VALUE_FIELDS
+
+def _merge_singletons(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Applies the merge rules to records that have no duplicate, which only normalizes their values."""
+    merged = df[[key] + _first_value_fields(key) + ['citation_count', 'source_db']].copy()
+    for field in LONGEST_LIST_FIELDS:
+        merged[field] = [value if isinstance(value, list) else [] for value in df[field]]
+    for field in UNION_FIELDS:
+        merged[field] = [sorted(set(value)) if isinstance(value, list) else [] for value in df[field]]
+    merged['is_open_access'] = [bool(value) if pd.notna(value) else None for value in df['is_open_access']]
+    return merged
+
+def _merge_duplicates(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Applies the merge rules to groups of duplicate records with bulk groupby aggregations."""
+    ordered = df.assign(_priority=df['source_db'].map(SOURCE_PRIORITY), _url=df['source_url'].astype(str))
+    ordered = ordered.sort_values([key, '_priority', '_url'], kind='stable').reset_index(drop=True)
+    # Groups come out in key order, each sorted by source priority, then by URL so that the
+    # merge does not depend on the order records arrived in.
+    grouped = ordered.groupby(key, sort=False)
+
+    merged = grouped[_first_value_fields(key)].first()
+    for field in LONGEST_LIST_FIELDS:
+        lengths = ordered[field].map(_list_length)
+        # idxmax keeps the first of equally long lists, i.e. the highest-priority one.
+        longest = lengths.groupby(ordered[key], sort=False).idxmax()
+        values = ordered[field].to_numpy()[longest.to_numpy()]
+        has_list = lengths.groupby(ordered[key], sort=False).max().to_numpy() >= 0
+        merged[field] = [value if present else [] for value, present in zip(values, has_list)]
+    for field in UNION_FIELDS:
+        items = ordered[[key, field]].explode(field).dropna(subset=[field]).drop_duplicates()
+        unions = _grouped_lists(items.sort_values([key, field]), key, field)
+        merged[field] = unions.reindex(merged.index)
+        merged[field] = [value if isinstance(value, list) else [] for value in merged[field]]
+    reported = ordered['is_open_access'].notna()
+    is_open_access = ordered['is_open_access'].where(reported, False).astype(bool)
+    is_open_access = is_open_access.groupby(ordered[key], sort=False).any().astype(object)
+    merged['is_open_access'] = is_open_access.where(reported.groupby(ordered[key], sort=False).any(), None)
+    merged['citation_count'] = grouped['citation_count'].max()
+    sources = ordered[[key, 'source_db']].drop_duplicates().sort_values([key, 'source_db'])
+    merged['source_db'] = [', '.join(names) for names in _grouped_lists(sources, key, 'source_db')]
+    return merged.reset_index()
+
+def _merge_groups(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Merges the records sharing a `key` value into one record per value, in key order.
+
+    Records are sorted once by (key, source priority) and every field rule runs as one groupby
+    aggregation over the groups that hold duplicates. Single-record groups, usually most of
+    them, skip the groupby and are only normalized.
+    """
+    duplicated = df[key].duplicated(keep=False).to_numpy()
+    parts = [_merge_singletons(df[~duplicated], key), _merge_duplicates(df[duplicated], key)]
+    parts = [part for part in parts if not part.empty]
+    if not parts:
+        return pd.DataFrame(columns=MERGED_COLUMNS)
+    merged = pd.concat(parts, ignore_index=True, sort=False)
+    return merged.sort_values(key, kind='stable', ignore_index=True)[MERGED_COLUMNS]
+
+def _normalized_dois(dois: pd.Series) -> pd.Series:
+    # An empty or all-missing column is not inferred as text, so make it text first. The nullable
+    # 'string' dtype keeps missing DOIs missing, where 'str' turns None into 'None' before pandas 3.
+    # The resolver prefixes stripped are those of enrich.normalize_doi().
+    dois = dois.astype('string').str.lower().str.strip()
+    return dois.str.replace(r'^https?://(?:dx\.)?doi\.org/', '', regex=True)
+
+def _cluster_without_doi(df: pd.DataFrame) -> pd.DataFrame:
+    """Labels the near-duplicate records without a DOI in a '_cluster' column."""
+    # Clusters grow from their first record, so fix the order: by source priority, then URL.
+    priority = df['source_db'].map(SOURCE_PRIORITY)
+    df = df.iloc[np.lexsort((df['source_url'].astype(str), priority))]
+    first_authors = [authors[0].full_name if isinstance(authors, list) and authors else None
+                     for authors in df['authors']]
+    years = pd.to_numeric(df['year'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    df['_cluster'] = near_duplicate_labels(df['title'].tolist(), years, first_authors)
+    return df
+
+def deduplicate_and_merge(df: pd.DataFrame, clusters: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """Deduplicates and merges records with a robust, field-by-field strategy.
+
+    Records without a DOI are merged on their near-duplicate `clusters`, one label per record
+    as revive_duplicates() returns them, or clustered here when none are given.
+    """
     print(f"\n--- Starting Deduplication & Merge ---")
     print(f"Initial record count: {len(df)}")
     
-    df['doi'] = df['doi'].str.lower().str.strip().replace(r'https?://doi.org/', '', regex=True)
-    df_with_doi = df[df['doi'].notna() & (df['doi'] != '')].copy()
-    df_no_doi = df[df['doi'].isna() | (df['doi'] == '')].copy()
+    df['doi'] = _normalized_dois(df['doi'])
+    has_doi = (df['doi'].notna() & (df['doi'] != '')).to_numpy()
+    df_with_doi = df[has_doi].copy()
+    df_no_doi = df[~has_doi].copy()
     
     print(f"Found {len(df_with_doi)} records with a DOI to merge.")
-    print(f"Found {len(df_no_doi)} records without a DOI to carry over.")
-
-    grouped = df_with_doi.groupby('doi')
-    
-    merged_records = []
-    
-    for doi, group in grouped:
-        source_priority = {'OpenAlex': 0, 'Crossref': 1, 'HAL': 2}
-        group['priority'] = group['source_db'].map(source_priority)
-        group = group.sort_values('priority')
-        
-        def get_best_value(field_name):
-            series = group[field_name].dropna()
-            return series.iloc[0] if not series.empty else None
-
-        best_author_list = max(group['authors'].dropna(), key=len, default=[])
-        best_editor_list = max(group['editors'].dropna(), key=len, default=[])
-
-        all_subjects = set()
-        for subjects_list in group['subjects'].dropna():
-            if isinstance(subjects_list, list):
-                all_subjects.update(subjects_list)
-
-        all_references = set()
-        for ref_list in group['referenced_works'].dropna():
-            if isinstance(ref_list, list):
-                all_references.update(ref_list)
-
-        merged_record = {
-            'doi': doi,
-            'title': get_best_value('title'),
-            'authors': best_author_list,
-            'editors': best_editor_list,
-            'year': get_best_value('year'),
-            'publication_date': get_best_value('publication_date'),
-            'journal_name': get_best_value('journal_name'),
-            'publisher': get_best_value('publisher'),
-            'work_type': get_best_value('work_type'),
-            'language': get_best_value('language'),
-            'is_open_access': group['is_open_access'].any(),
-            'abstract': get_best_value('abstract'),
-            'subjects': sorted(list(all_subjects)),
-            'source_url': get_best_value('source_url'),
-            'citation_count': group['citation_count'].max(),
-            'relation': get_best_value('relation'),
-            'source_db': ', '.join(sorted(group['source_db'].unique())),
-            'referenced_works': sorted(list(all_references))
-        }
-        merged_records.append(merged_record)
-
-    df_merged = pd.DataFrame(merged_records)
-    df_final = pd.concat([df_merged, df_no_doi], ignore_index=True, sort=False)
-    
-    if 'priority' in df_final.columns:
-        df_final = df_final.drop(columns=['priority'])
+    print(f"Found {len(df_no_doi)} records without a DOI to match on title, year and first author.")
+
+    df_final = _merge_groups(df_with_doi, 'doi')
+    # Clustering needs at least one record.
+    if not df_no_doi.empty:
+        if clusters is None:
+            df_no_doi = _cluster_without_doi(df_no_doi)
+        else:
+            df_no_doi['_cluster'] = np.asarray(clusters)[~has_doi]
+        df_clustered = _merge_groups(df_no_doi, '_cluster')
+        print(f"Merged {len(df_no_doi) - len(df_clustered)} near-duplicate records without a DOI.")
+        df_final = pd.concat([df_final, df_clustered], ignore_index=True, sort=False)
         
     print(f"Merge complete. Final unique record count: {len(df_final)}")
     return df_final
 
-def calculate_relevance_scores(df: pd.DataFrame) -> pd.DataFrame:
-    """Calculates a relevance score for each work, including citation analysis."""
+def revive_duplicates(kept: List[BlanchotWork], pending: List[BlanchotWork], bound, threshold: int
+                      ) -> Tuple[List[BlanchotWork], np.ndarray]:
+    """Returns the set-aside works that the merge would combine with a kept work, and the clusters.
+
+    A merged record takes its fields from every record in its group, so a group holding a kept
+    work must be merged whole. A group made only of set-aside works scores at most the sum of
+    their `bound(work)`, and is only merged when that reaches `threshold`. The near-duplicate
+    cluster labels cover the kept works followed by the revived ones, -1 for records with a DOI,
+    so that deduplicate_and_merge() does not cluster them again.
+    """
+    works = kept + pending
+    dois = _normalized_dois(pd.Series([work.doi for work in works], dtype=object))
+    has_doi = (dois.notna() & (dois != '')).to_numpy()
+    is_pending = np.arange(len(works)) >= len(kept)
+
+    kept_dois = set(dois[has_doi & ~is_pending])
+    revived = is_pending & has_doi & dois.isin(kept_dois).to_numpy()
+
+    labels = np.full(len(works), -1)
+    no_doi = np.flatnonzero(~has_doi)
+    if len(no_doi):
+        clustered = _cluster_without_doi(pd.DataFrame({
+            'source_db': [works[i].source_db for i in no_doi],
+            'source_url': [works[i].source_url for i in no_doi],
+            'title': [works[i].title for i in no_doi],
+            'authors': [works[i].authors for i in no_doi],
+            'year': [works[i].year for i in no_doi],
+            '_position': no_doi,
+        }))
+        labels[clustered['_position'].to_numpy()] = clustered['_cluster'].to_numpy()
+        kept_clusters = labels[no_doi[~is_pending[no_doi]]]
+        revived[no_doi[is_pending[no_doi] & np.isin(labels[no_doi], kept_clusters)]] = True
+
+    # The groups left are made only of set-aside works; only those of several works may add up.
+    groups = pd.Series(np.where(has_doi, 'doi:' + dois.fillna('').to_numpy(dtype=object),
+                                [f"cluster:{label}" for label in labels]))[is_pending & ~revived]
+    groups = groups[groups.duplicated(keep=False)]
+    if len(groups):
+        bounds = pd.Series([bound(works[i]) for i in groups.index], index=groups.index)
+        reaching = bounds.groupby(groups).transform('sum') >= threshold
+        revived[reaching.index[reaching.to_numpy()]] = True
+    merged = np.r_[np.flatnonzero(~is_pending), np.flatnonzero(revived)]
+    return [works[i] for i in np.flatnonzero(revived)], labels[merged]
+
+# Each keyword found anywhere in a work's title, abstract or subjects adds 2 points, once.
+POSITIVE_KEYWORDS = ['levinas', 'derrida', 'deconstruction', 'literary theory', 'the neuter']
+KEY_WORK_SUFFIXES = tuple(f"/{work_id}" for work_id in BLANCHOT_KEY_WORKS)
+# The beginnings of each keyword that end at a space ('literary' of 'literary theory').
+KEYWORD_HEADS = {keyword: tuple(keyword[:i] for i, char in enumerate(keyword) if char == ' ')
+                 for keyword in POSITIVE_KEYWORDS}
+
+def _lowered_text(column: pd.Series) -> pd.Series:
+    """Lowercases a text column as Python strings, with missing values as empty strings."""
+    return column.astype(object).where(column.notna(), '').str.lower()
+
+def _cites_key_work(referenced_works: pd.Series) -> pd.Series:
+    """Flags the works whose references include one of BLANCHOT_KEY_WORKS."""
+    references = referenced_works.explode()
+    # A reference is a key work when its last path segment is one of the key work IDs.
+    cites = references.isin(BLANCHOT_KEY_WORKS) | references.str.endswith(KEY_WORK_SUFFIXES, na=False)
+    return cites.groupby(level=0).any().reindex(referenced_works.index, fill_value=False)
+
+def _relevance_scores(df: pd.DataFrame, seed_index) -> np.ndarray:
+    """Scores works whose abstracts are text or missing.
+
+    Every rule is applied to whole columns: the lowercased text is built once, each keyword is
+    one vectorized substring test and the citation bonus comes from one membership test over
+    all referenced IDs.
+    """
+    title = _lowered_text(df['title'])
+    abstract = _lowered_text(df['abstract'])
+    subjects = _lowered_text(df['subjects'].map(lambda s: ' '.join(s) if isinstance(s, list) else None))
+    search_text = title + ' ' + abstract + ' ' + subjects
+
+    # Seed titles are matched on normalized keys, which forgive quotes, diacritics and subtitles.
+    is_seed = seed_index.match_many(df['title'])
+    score = np.where(is_seed, 100, 0)
+    score += np.where(title.str.contains('maurice blanchot', regex=False), 10,
+                      np.where(title.str.contains('blanchot', regex=False), 7, 0))
+    score += np.where(abstract.str.contains('maurice blanchot', regex=False), 5, 0)
+    # A plain substring test per keyword runs in C over the whole column, which beats scanning
+    # every text once with a regex alternation of the keywords.
+    for keyword in POSITIVE_KEYWORDS:
+        score += np.where(search_text.str.contains(keyword, regex=False), 2, 0)
+    # The OpenAlex harvest tags the key works a work cites; only untagged works, from other
+    # sources or older snapshots, have their references searched.
+    cites = np.array([bool(tags) if isinstance(tags, list) else False for tags in df['cited_key_works']], dtype=bool)
+    cites[~cites] = _cites_key_work(df['referenced_works'][~cites]).to_numpy()
+    score += np.where(cites, 50, 0)
+    return score
+
+def _abstract_points_bound(abstract: LazyAbstract) -> int:
+    """Bounds the points an abstract can add to a score, from its vocabulary alone.
+
+    Words are never split across the inverted index's keys, so any part of 'maurice blanchot' or
+    of a keyword that the abstract supplies contains one of their words within a single key.
+    """
+    vocabulary = ' '.join(abstract.inverted_index).lower()
+    points = 5 if 'maurice' in vocabulary and 'blanchot' in vocabulary else 0
+    for keyword in POSITIVE_KEYWORDS:
+        if any(word in vocabulary for word in keyword.split()):
+            points += 2
+    return points
+
+def _holds_keyword(text: str, keyword: str) -> bool:
+    # Fields are joined with spaces for the keyword search, so a keyword can start at the end of
+    # one field and finish in the next, which may come from another record once merged.
+    return keyword in text or text.endswith(KEYWORD_HEADS[keyword])
+
+def _lazy_abstract_holds_keyword(vocabulary: str, last_word: str, keyword: str) -> bool:
+    return all(word in vocabulary for word in keyword.split()) or last_word.endswith(KEYWORD_HEADS[keyword])
+
+def score_bound(work: BlanchotWork, seed_index) -> int:
+    """Bounds the relevance points a translated work can bring to a score, alone or once merged.
+
+    A merged record takes each of its values from one of its members, so it scores at most the
+    sum of its members' bounds. Checked per record as pages stream in, so the seed index is only
+    searched while the bound is still below RELEVANCE_THRESHOLD, the only value it is held to.
+    """
+    title = work.title.lower() if isinstance(work.title, str) else ''
+    points = 10 if 'maurice blanchot' in title else 7 if 'blanchot' in title else 0
+    fields = [title]
+    if isinstance(work.subjects, list):
+        fields += [subject.lower() for subject in work.subjects if isinstance(subject, str)]
+    vocabulary = last_word = ''
+    if isinstance(work.abstract, LazyAbstract):
+        if work.abstract.inverted_index:
+            vocabulary = ' '.join(work.abstract.inverted_index).lower()
+            last_word = max(work.abstract.inverted_index.items(), key=lambda item: max(item[1], default=-1))[0].lower()
+            if 'maurice' in vocabulary and 'blanchot' in vocabulary:
+                points += 5
+    elif isinstance(work.abstract, str):
+        abstract = work.abstract.lower()
+        fields.append(abstract)
+        if 'maurice blanchot' in abstract:
+            points += 5
+    for keyword in POSITIVE_KEYWORDS:
+        if (any(_holds_keyword(field, keyword) for field in fields)
+                or (vocabulary and _lazy_abstract_holds_keyword(vocabulary, last_word, keyword))):
+            points += 2
+    if work.cited_key_works or (isinstance(work.referenced_works, list) and any(
+            isinstance(reference, str) and (reference in BLANCHOT_KEY_WORKS or reference.endswith(KEY_WORK_SUFFIXES))
+            for reference in work.referenced_works)):
+        points += 50
+    if points < RELEVANCE_THRESHOLD and title and seed_index.match(work.title) is not None:
+        points += 100
+    return points
+
+def may_reach_threshold(work: BlanchotWork, seed_index) -> bool:
+    """Tells whether a translated work could score RELEVANCE_THRESHOLD, alone or once merged."""
+    return score_bound(work, seed_index) >= RELEVANCE_THRESHOLD
+
+def calculate_relevance_scores(df: pd.DataFrame, threshold: Optional[int] = None) -> pd.DataFrame:
+    """Calculates a relevance score for each work, including citation analysis.
+
+    Lazy OpenAlex abstracts are first left out. They are then reconstructed only for the works
+    that could reach `threshold` with them, and those works are scored again. The others keep
+    their score without the abstract, which stays below `threshold`. With no threshold every
+    abstract is reconstructed.
+    """
     print("\n--- Calculating Relevance Scores ---")
     
-    seed_titles = load_seed_titles() # Assumes you have the load_seed_titles function
-    
-    positive_keywords = ['levinas', 'derrida', 'deconstruction', 'literary theory', 'the neuter']
-    
-    def get_score(row):
-        score = 0
-        title = str(row.get('title') or '').lower()
-        abstract = str(row.get('abstract') or '').lower()
-        
-        # --- START: CORRECTED CODE ---
-        # Safely handle the subjects field by checking if it's a list
-        subjects_list = row.get('subjects')
-        subjects = ' '.join(subjects_list).lower() if isinstance(subjects_list, list) else ''
-        # --- END: CORRECTED CODE ---
-        
-        search_text = f"{title} {abstract} {subjects}"
-
-        if title in seed_titles:
-            score += 100
-
-        if 'maurice blanchot' in title: score += 10
-        elif 'blanchot' in title: score += 7
-        if 'maurice blanchot' in abstract: score += 5
-            
-        for keyword in positive_keywords:
-            if keyword in search_text: score += 2
-        
-        referenced_ids = set()
-        ref_works = row.get('referenced_works', [])
-        if isinstance(ref_works, list):
-            for url in ref_works:
-                if isinstance(url, str):
-                    if work_id := url.split('/')[-1]:
-                        referenced_ids.add(work_id)
-        
-        if referenced_ids.intersection(BLANCHOT_KEY_WORKS):
-            score += 50
-                
-        return score
-
-    df['relevance_score'] = df.apply(get_score, axis=1)
+    seed_index = load_seed_index()
+
+    is_lazy = df['abstract'].map(lambda value: isinstance(value, LazyAbstract)).to_numpy(dtype=bool)
+    score = _relevance_scores(df.assign(abstract=df['abstract'].mask(is_lazy)), seed_index)
+    needed = is_lazy.copy()
+    if threshold is not None:
+        bounds = np.array([_abstract_points_bound(value) for value in df['abstract'][is_lazy]], dtype=int)
+        needed[is_lazy] = score[is_lazy] + bounds >= threshold
+    if needed.any():
+        df['abstract'] = df['abstract'].astype(object)
+        df.loc[needed, 'abstract'] = [value.text() for value in df['abstract'][needed]]
+        score[needed] = _relevance_scores(df[needed], seed_index)
+    print(f"Reconstructed {needed.sum()} of {is_lazy.sum()} OpenAlex abstracts for scoring.")
+
+    df['relevance_score'] = score
     print("Relevance scores calculated.")
     return df
 
+def build_citation_graph(works: List[BlanchotWork]) -> CitationGraph:
+    """Builds the citation graph of every work with an OpenAlex ID, harvested or enriched."""
+    openalex = [work for work in works if work.openalex_id]
+    graph = CitationGraph.from_works([work.openalex_id for work in openalex],
+                                     [work.referenced_works for work in openalex])
+    print(f"Built the citation graph: {len(graph)} works, {graph.num_edges} citations.")
+    return graph
+
+def add_citation_signals(df: pd.DataFrame, graph: CitationGraph) -> pd.DataFrame:
+    """Adds the graph's multi-hop citation signals as columns, 0 for works without an OpenAlex ID."""
+    signals = graph.signals(BLANCHOT_KEY_WORKS).reindex(df['openalex_id'].to_numpy(dtype=object)).fillna(0)
+    # Reindexing makes every column float to hold the missing works; only the rank is one.
+    for column in SIGNAL_COLUMNS:
+        dtype = 'float64' if column == 'citation_rank' else 'int64'
+        df[column] = signals[column].to_numpy(dtype=dtype)
+    return df
+
 # --- Main Execution ---
 def main():
     """Main function for the Discover, Enrich, and Combine pipeline."""
+    parser = argparse.ArgumentParser(description="Build the Blanchot bibliography.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--delta', action='store_true',
+                      help="Only fetch records created or updated since the last successful run "
+                           "and upsert them into that run's records.")
+    mode.add_argument('--replay', action='store_true',
+                      help="Rebuild data.csv from the archived raw records of earlier harvests, "
+                           "without touching the network.")
+    args = parser.parse_args()
+
     print("--- Starting Data Synthesis ---")
-    
-    print("Fetching data from OpenAlex...")
-    oa_data = [from_openalex_to_blanchotwork(work) for work in get_oa_work()]
-    
-    print("\nFetching data from HAL...")
-    hal_data = [from_hal_to_blanchotwork(work) for work in get_hal_work()]
-    
-    print("\nFetching data from Crossref...")
-    cr_data = [from_crossref_to_blanchotwork(work) for work in get_cr_work()]
+    # Works that cannot reach the relevance threshold are set aside as they stream in, and only
+    # come back if the merge needs them.
+    seed_index = load_seed_index()
+    prefilter = Prefilter(partial(may_reach_threshold, seed_index=seed_index))
+    run_started = delta.today()
+    since = delta.load_state().get('watermark') if args.delta else None
+    previous_records = delta.load_snapshot() if since else []
+    if args.delta and not (since and previous_records):
+        print("No previous run to build on; falling back to a full harvest.")
+        since, previous_records = None, []
+    elif since:
+        print(f"Delta harvest: fetching records changed since {since}.")
+    
+    if args.replay:
+        print("Replaying archived raw records from OpenAlex, HAL and Crossref...")
+        harvested = harvest_sources([
+            ('OpenAlex', replay_oa_work, from_openalex_to_blanchotwork, {'cited_works': BLANCHOT_KEY_WORKS}),
+            ('HAL', replay_hal_work, from_hal_to_blanchotwork, {}),
+            ('Crossref', replay_cr_work, from_crossref_to_blanchotwork, {}),
+        ], prefilter)
+    else:
+        print("Fetching data from OpenAlex, HAL and Crossref...")
+        harvested = harvest_sources([
+            ('OpenAlex', iter_oa_work, from_openalex_to_blanchotwork,
+             {'max_workers': OA_WORKERS, 'since': since, 'cited_works': BLANCHOT_KEY_WORKS}),
+            ('HAL', iter_hal_work, from_hal_to_blanchotwork, {'max_workers': HAL_WORKERS, 'since': since}),
+            ('Crossref', iter_cr_work, from_crossref_to_blanchotwork, {'max_workers': CR_WORKERS, 'since': since}),
+        ], prefilter)
     
     print("\n--- Combining Data ---")
-    df_initial = pd.DataFrame(oa_data + hal_data + cr_data)
-    
-    df_merged = deduplicate_and_merge(df_initial)
-    df_scored = calculate_relevance_scores(df_merged)
+    # Popping the per-source lists lets them be freed as soon as the DataFrame is built.
+    works = [work for source in ('OpenAlex', 'HAL', 'Crossref') for work in harvested.pop(source)]
+    if previous_records:
+        previous = [BlanchotWork(**from_snapshot_record(record)) for record in previous_records]
+        unchanged = delta.unchanged_records(previous, works + prefilter.pending)
+        works = prefilter.screen(unchanged) + works
+    # The snapshot keeps the set-aside works too: a later change may make them count.
+    if not args.replay:
+        delta.save_snapshot(works + prefilter.pending)
+    # So do the store's per-source records, which are kept as translated, before enrichment.
+    store = WorkStore()
+    upserted, deleted = store.sync_records(works + prefilter.pending)
+    print(f"Per-source records in the store at {STORE_FILE}: {upserted} upserted, {deleted} deleted.")
+    # Enrichment can give set-aside records what they need to score, so they are screened again.
+    enrich_from_openalex(works + prefilter.pending, offline=args.replay)
+    works += prefilter.rescreen()
+    revived, clusters = revive_duplicates(works, prefilter.pending, partial(score_bound, seed_index=seed_index),
+                                          RELEVANCE_THRESHOLD)
+    print(f"Set aside {len(prefilter.pending)} works that cannot reach the threshold; "
+          f"{len(revived)} of them merge into a record that may and are combined after all.")
+    record_count = len(works) + len(prefilter.pending)
+    # The graph covers the whole harvest, so that the signals do not depend on the prefilter.
+    citation_graph = build_citation_graph(works + prefilter.pending)
+    # The snapshot, the enrichment and the graph were the last to need the others, so they are let go.
+    prefilter.pending.clear()
+    works += revived
+    df_initial = works_to_frame(works)
+    
+    df_merged = deduplicate_and_merge(df_initial, clusters)
+    df_scored = calculate_relevance_scores(df_merged, RELEVANCE_THRESHOLD)
+    df_scored = add_citation_signals(df_scored, citation_graph)
     
     # Prune the dataset, keeping only works with a minimum relevance score
-    RELEVANCE_THRESHOLD = 8
     print(f"\nPruning dataset. Keeping works with relevance score >= {RELEVANCE_THRESHOLD}...")
     original_count = len(df_scored)
     df_pruned = df_scored[df_scored['relevance_score'] >= RELEVANCE_THRESHOLD].copy()
     removed_count = original_count - len(df_pruned)
     print(f"Removed {removed_count} low-relevance records.")
     
-    # Sort the final dataset by the new relevance score
-    df_final = df_pruned.sort_values('relevance_score', ascending=False).reset_index(drop=True)
+    # Sort the final dataset by the new relevance score. Sources stream pages in whatever order
+    # they arrive, so ties are broken on the source URL to keep the CSV stable between runs.
+    df_final = df_pruned.sort_values(
+        ['relevance_score', 'source_url'], ascending=[False, True], kind='stable'
+    ).reset_index(drop=True)
+
+    df_final['abstract'] = df_final['abstract'].map(abstract_text)
+    # The Parquet dataset keeps the list columns, and the references, as they are.
+    write_parquet(df_final)
+    print(f"Saved the Parquet dataset, partitioned by year, to {PARQUET_DIR}")
+    upserted, deleted = store.sync_works(df_final)
+    store.close()
+    print(f"Works in the store at {STORE_FILE}: {upserted} upserted, {deleted} deleted.")
 
     # --- Final Formatting for CSV Output ---
     print("\nFormatting data for final CSV output...")
@@ -703,12 +1056,13 @@ def main():
         df_final[col] = df_final[col].apply(
             lambda x: ' | '.join([item.full_name for item in x]) if isinstance(x, list) else ''
         )
-    df_final['subjects'] = df_final['subjects'].apply(
-        lambda x: ' | '.join(x) if isinstance(x, list) else ''
-    )
-    # Drop the raw referenced_works list before saving to keep the CSV clean
-    if 'referenced_works' in df_final.columns:
-        df_final = df_final.drop(columns=['referenced_works'])
+    for col in ['subjects', 'cited_key_works']:
+        df_final[col] = df_final[col].apply(
+            lambda x: ' | '.join(x) if isinstance(x, list) else ''
+        )
+    # Drop the raw referenced_works list and the OpenAlex and HAL IDs, which the Parquet dataset
+    # and the store keep, before saving to keep the CSV clean
+    df_final = df_final.drop(columns=['referenced_works', 'openalex_id', 'hal_id'])
     
     # --- Save the File ---
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -718,6 +1072,9 @@ def main():
     
     df_final.to_csv(output_path, index=False)
     
+    if not args.replay:
+        delta.save_state(run_started, record_count)
+    
     print(f"\n--- Process Complete ---")
     print(f"Successfully saved {len(df_final)} unique, scored, and pruned records to {output_path}")
 
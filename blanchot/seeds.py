@@ -0,0 +1,221 @@
+import hashlib
+import math
+import os
+import pickle
+import re
+
+import numpy as np
+import pandas as pd
+
+from dedup import normalize_text, packed_trigrams
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED_TITLES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seed_titles.txt')
+SEED_CACHE_DIR = os.environ.get('BLANCHOT_SEED_CACHE_DIR', os.path.join(PROJECT_ROOT, '.cache', 'seeds'))
+# Bumped whenever the index layout or the key normalization changes, to invalidate cached indexes.
+SEED_INDEX_VERSION = 3
+# A title matches a seed when their normalized trigram sets are at least this similar (Jaccard).
+SEED_SIMILARITY_THRESHOLD = 0.85
+# Seeds are indexed under their whole title only, so a generic main title such as "The Writing
+# of the Disaster" never stands for a longer seed. A title is looked up under its whole title,
+# then without its bracketed notes, then under its main title ("Experience and Distance" of
+# "Experience and Distance: Heidegger, Blanchot, Levinas"). The shortened keys only count when
+# they have this many words and characters once normalized: "Maurice Blanchot" does not, and
+# neither does "Il y a".
+MIN_MAIN_TITLE_WORDS = 3
+MIN_MAIN_TITLE_LENGTH = 16
+
+_BRACKETED = re.compile(r'\[[^\]]*\]|\([^)]*\)')
+_SUBTITLE = re.compile(r'\s*(?::|\s[-–—]\s).*$', re.DOTALL)
+
+
+def seed_key(title) -> str:
+    """Returns the key a seed title is indexed under: its whole normalized title."""
+    return normalize_text(title)
+
+def title_keys(title) -> list:
+    """Returns the keys a title is looked up under: whole, without its brackets, and its main title.
+
+    The shortened keys only count when they are long enough to say something on their own.
+    """
+    full = normalize_text(title)
+    if not full:
+        return []
+    unbracketed = _BRACKETED.sub(' ', title)
+    keys = [full]
+    for key in (normalize_text(unbracketed), normalize_text(_SUBTITLE.sub('', unbracketed))):
+        if (key not in keys and len(key.split()) >= MIN_MAIN_TITLE_WORDS
+                and len(key) >= MIN_MAIN_TITLE_LENGTH):
+            keys.append(key)
+    return keys
+
+def _normalized_column(texts: pd.Series) -> pd.Series:
+    """normalize_text() over a column of Arrow strings: in Arrow for ASCII text, per value for the rest."""
+    is_ascii = ~texts.str.contains(r'[^\x00-\x7f]', regex=True).to_numpy(dtype=bool)
+    # On ASCII text, casefolding is lowercasing.
+    normalized = texts.str.lower().str.replace(r'[\W_]+', ' ', regex=True).str.strip()
+    if not is_ascii.all():
+        normalized[~is_ascii] = texts[~is_ascii].astype(object).map(normalize_text)
+    return normalized
+
+def _key_columns(titles: pd.Series) -> pd.DataFrame:
+    """title_keys() over a column of titles, as one column per key, missing where a title lacks it."""
+    titles = titles.where(titles.map(lambda title: isinstance(title, str)), '').astype('string[pyarrow]')
+    full = _normalized_column(titles)
+    unbracketed = titles.str.replace(_BRACKETED.pattern, ' ', regex=True)
+    unbracketed_key = _normalized_column(unbracketed)
+    main_key = _normalized_column(unbracketed.str.replace(f"(?s){_SUBTITLE.pattern}", '', regex=True))
+    keys = pd.DataFrame({'full': full.where(full != '')})
+    for name, key, shorter_than in (('unbracketed', unbracketed_key, [full]),
+                                    ('main', main_key, [full, unbracketed_key])):
+        keep = (key.str.count(' ') + 1 >= MIN_MAIN_TITLE_WORDS) & (key.str.len() >= MIN_MAIN_TITLE_LENGTH)
+        for longer in shorter_than:
+            keep &= key != longer
+        keys[name] = key.where(keep)
+    return keys
+
+def _trigrams(key: str) -> frozenset:
+    return frozenset(key[i:i + 3] for i in range(len(key) - 2))
+
+
+class SeedIndex:
+    """Normalized lookup index over the seed titles.
+
+    Holds the key of every seed for exact lookups, plus an inverted index from trigrams to
+    keys for approximate ones. An approximate lookup only reads the postings of the query's
+    rarest trigrams: a key at least SEED_SIMILARITY_THRESHOLD similar to the query must contain
+    one of them, so the cost depends on how rare the title's trigrams are, not on the number
+    of seeds.
+    """
+
+    def __init__(self, titles):
+        self.titles = list(titles)
+        self.exact = {}
+        self.key_seeds = []
+        self.key_lengths = []
+        self.key_trigrams = []
+        self.postings = {}
+        for seed, title in enumerate(self.titles):
+            key = seed_key(title)
+            if not key or key in self.exact:
+                continue
+            self.exact[key] = seed
+            key_id = len(self.key_seeds)
+            self.key_seeds.append(seed)
+            self.key_lengths.append(len(key))
+            self.key_trigrams.append(_trigrams(key))
+            for trigram in self.key_trigrams[-1]:
+                self.postings.setdefault(trigram, []).append(key_id)
+        self.postings = {trigram: np.array(key_ids, dtype=np.int32) for trigram, key_ids in self.postings.items()}
+        self.key_sizes = np.array([len(trigrams) for trigrams in self.key_trigrams], dtype=np.int32)
+        self.key_lengths = np.array(self.key_lengths, dtype=np.int32)
+        # Every trigram of every seed key, packed as in packed_trigrams(), for the column screen.
+        self.trigram_codes = np.unique(packed_trigrams(list(self.exact))[0])
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _similar_key(self, key):
+        trigrams = _trigrams(key)
+        if not trigrams:
+            return None
+        prefix_length = len(trigrams) - math.ceil(SEED_SIMILARITY_THRESHOLD * len(trigrams)) + 1
+        postings = sorted((self.postings[trigram] for trigram in trigrams if trigram in self.postings), key=len)
+        if len(postings) < len(trigrams) - prefix_length + 1:
+            return None
+        candidates = np.unique(np.concatenate(postings[:prefix_length]))
+        # Sets this similar cannot differ much in size either, and neither may the titles'
+        # lengths, since a trigram set ignores repeated words.
+        sizes, lengths = self.key_sizes[candidates], self.key_lengths[candidates]
+        candidates = candidates[(sizes >= SEED_SIMILARITY_THRESHOLD * len(trigrams))
+                                & (sizes * SEED_SIMILARITY_THRESHOLD <= len(trigrams))
+                                & (lengths >= SEED_SIMILARITY_THRESHOLD * len(key))
+                                & (lengths * SEED_SIMILARITY_THRESHOLD <= len(key))]
+        if not len(candidates):
+            return None
+        # The trigrams a candidate shares with the title are its occurrences in their postings.
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.key_sizes))[candidates]
+        similar = shared >= SEED_SIMILARITY_THRESHOLD * (len(trigrams) + self.key_sizes[candidates] - shared)
+        return int(candidates[similar][0]) if similar.any() else None
+
+    def _may_be_similar(self, keys) -> np.ndarray:
+        """Tells for each key whether _similar_key() could find a seed for it.
+
+        A key at least SEED_SIMILARITY_THRESHOLD similar to a seed key shares at least that
+        share of its distinct trigrams with it, so keys with fewer trigrams found in any seed
+        key are ruled out, for all keys at once.
+        """
+        trigrams, owner = packed_trigrams(keys)
+        # Numbering the distinct trigrams packs each (key, trigram) pair into one integer, and
+        # the pairs come out grouped by key, so a sort that drops repeats is cheap.
+        trigram_ids, distinct_trigrams = pd.factorize(trigrams)
+        pairs = np.sort(owner * len(distinct_trigrams) + trigram_ids)
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]][:len(pairs)]]
+        owner, trigram_ids = np.divmod(pairs, max(len(distinct_trigrams), 1))
+        total = np.bincount(owner, minlength=len(keys))
+        is_known = np.isin(distinct_trigrams, self.trigram_codes)
+        known = np.bincount(owner, weights=is_known[trigram_ids], minlength=len(keys))
+        return (total > 0) & (known >= SEED_SIMILARITY_THRESHOLD * total)
+
+    def match_many(self, titles) -> np.ndarray:
+        """Tells for each title whether it matches a seed, as match() would, a column at a time.
+
+        Each distinct title is looked up once. Its keys are built as whole columns and looked up
+        exactly with one dict map per key; only the keys of titles that miss and pass the
+        _may_be_similar() screen are looked up approximately, one at a time.
+        """
+        codes, uniques = pd.factorize(pd.Series(titles, dtype=object))
+        keys = _key_columns(pd.Series(uniques, dtype=object))
+        found = np.zeros(len(uniques), dtype=bool)
+        for column in keys:
+            found |= keys[column].astype(object).map(self.exact).notna().to_numpy()
+        misses = keys[~found].melt(ignore_index=False)['value'].dropna()
+        misses = misses[self._may_be_similar(misses.tolist())]
+        for position, key in zip(misses.index, misses):
+            if not found[position]:
+                found[position] = self._similar_key(key) is not None
+        # Missing titles are coded -1, which picks the trailing False.
+        return np.r_[found, False][codes]
+
+    def match(self, title):
+        """Returns the seed title a title matches, exactly or approximately once normalized, or None."""
+        keys = title_keys(title)
+        for key in keys:
+            if key in self.exact:
+                return self.titles[self.exact[key]]
+        for key in keys:
+            key_id = self._similar_key(key)
+            if key_id is not None:
+                return self.titles[self.key_seeds[key_id]]
+        return None
+
+
+def load_seed_index(filepath=SEED_TITLES_FILE, cache_dir=SEED_CACHE_DIR) -> SeedIndex:
+    """Loads the seed index for a seed titles file, building it only when the file has changed.
+
+    Built indexes are cached on disk under the SHA-256 of the file's content.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            content = f.read()
+    except FileNotFoundError:
+        print(f"Warning: Seed titles file not found at '{filepath}'. Skipping this scoring rule.")
+        return SeedIndex([])
+
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    cache_path = os.path.join(cache_dir, f"seed-index-v{SEED_INDEX_VERSION}-{digest}.pickle")
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+
+    titles = [line.strip() for line in content.decode('utf-8').splitlines() if line.strip()]
+    index = SeedIndex(titles)
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = f"{cache_path}.tmp"
+    with open(temp_path, 'wb') as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, cache_path)
+    print(f"Built the seed index for {len(index)} titles.")
+    return index
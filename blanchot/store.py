@@ -0,0 +1,224 @@
+import dataclasses
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+
+import pandas as pd
+
+from enrich import normalize_doi
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STORE_FILE = os.environ.get('BLANCHOT_STORE', os.path.join(PROJECT_ROOT, 'outputs', 'blanchot.sqlite'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS works (
+    work_key TEXT PRIMARY KEY,
+    doi TEXT,
+    openalex_id TEXT,
+    hal_id TEXT,
+    title TEXT,
+    year INTEGER,
+    publication_date TEXT,
+    journal_name TEXT,
+    publisher TEXT,
+    work_type TEXT,
+    language TEXT,
+    is_open_access INTEGER,
+    abstract TEXT,
+    subjects TEXT,
+    source_url TEXT,
+    citation_count INTEGER,
+    relation TEXT,
+    source_db TEXT,
+    cited_key_works TEXT,
+    relevance_score INTEGER,
+    key_work_citations INTEGER,
+    second_hop_citations INTEGER,
+    citation_rank REAL,
+    content_hash TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS works_doi ON works (doi);
+CREATE INDEX IF NOT EXISTS works_openalex_id ON works (openalex_id);
+CREATE INDEX IF NOT EXISTS works_hal_id ON works (hal_id);
+CREATE INDEX IF NOT EXISTS works_year ON works (year);
+CREATE INDEX IF NOT EXISTS works_relevance_score ON works (relevance_score);
+
+CREATE TABLE IF NOT EXISTS authors (
+    work_key TEXT NOT NULL REFERENCES works (work_key) ON DELETE CASCADE,
+    role TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    full_name TEXT,
+    given_name TEXT,
+    family_name TEXT,
+    PRIMARY KEY (work_key, role, position)
+);
+CREATE INDEX IF NOT EXISTS authors_full_name ON authors (full_name);
+
+CREATE TABLE IF NOT EXISTS work_references (
+    work_key TEXT NOT NULL REFERENCES works (work_key) ON DELETE CASCADE,
+    referenced_id TEXT NOT NULL,
+    PRIMARY KEY (work_key, referenced_id)
+);
+CREATE INDEX IF NOT EXISTS work_references_referenced_id ON work_references (referenced_id);
+
+CREATE TABLE IF NOT EXISTS records (
+    source_db TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    doi TEXT,
+    openalex_id TEXT,
+    hal_id TEXT,
+    title TEXT,
+    year INTEGER,
+    source_url TEXT,
+    record TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (source_db, source_id)
+);
+CREATE INDEX IF NOT EXISTS records_doi ON records (doi);
+CREATE INDEX IF NOT EXISTS records_openalex_id ON records (openalex_id);
+CREATE INDEX IF NOT EXISTS records_hal_id ON records (hal_id);
+"""
+# Scalar columns of the works table, in table order, as found in the scored DataFrame.
+WORK_COLUMNS = ['doi', 'openalex_id', 'hal_id', 'title', 'year', 'publication_date', 'journal_name',
+                'publisher', 'work_type', 'language', 'is_open_access', 'abstract', 'subjects',
+                'source_url', 'citation_count', 'relation', 'source_db', 'cited_key_works',
+                'relevance_score', 'key_work_citations', 'second_hop_citations', 'citation_rank']
+# Columns of the records table copied out of each record, to be indexed or read without parsing it.
+RECORD_COLUMNS = ['doi', 'openalex_id', 'hal_id', 'title', 'year', 'source_url']
+
+
+def source_id(record) -> str:
+    """Returns the ID a per-source record has in its source: OpenAlex ID, HAL docid or Crossref DOI.
+
+    Records without one, such as HAL records saved before their docid was kept, fall back to
+    their source URL.
+    """
+    if record.source_db == 'OpenAlex' and record.openalex_id:
+        return record.openalex_id
+    if record.source_db == 'HAL' and record.hal_id:
+        return record.hal_id
+    if record.source_db == 'Crossref' and normalize_doi(record.doi):
+        return normalize_doi(record.doi)
+    return record.source_url
+
+def _value(value):
+    """Turns a DataFrame cell into an SQLite value: lists and dicts as JSON, missing values as NULL."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, sort_keys=True)
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+
+
+class WorkStore:
+    """Embedded SQLite store of the merged, scored works, their authors and their references,
+    and of the per-source records they were merged from.
+
+    Both are synchronized with a run's results by upserting only what changed, compared on a
+    hash of their content, so an unchanged row is never rewritten and a work's authors and
+    references are left alone. Rows a run no longer produces are deleted. Works are keyed by
+    DOI, or by source URL when they have none; records by their source and their ID in it.
+    """
+
+    def __init__(self, path=STORE_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def _delete_missing(self, table, key_columns, keys):
+        """Deletes the rows of `table` whose key is not in `keys`."""
+        columns = ', '.join(key_columns)
+        self.connection.execute(f"CREATE TEMP TABLE current_keys ({columns})")
+        self.connection.executemany(
+            f"INSERT INTO current_keys VALUES ({', '.join('?' * len(key_columns))})", keys
+        )
+        deleted = self.connection.execute(
+            f"DELETE FROM {table} WHERE ({columns}) NOT IN (SELECT {columns} FROM current_keys)"
+        ).rowcount
+        self.connection.execute("DROP TABLE current_keys")
+        return deleted
+
+    def sync_works(self, df: pd.DataFrame) -> tuple:
+        """Upserts the scored works of a run, abstracts as text. Returns (upserted, deleted)."""
+        now = _now()
+        table = df.assign(doi=df['doi'].map(normalize_doi))
+        existing = dict(self.connection.execute("SELECT work_key, content_hash FROM works"))
+
+        works, authors, references, keys = [], [], [], []
+        rows = zip(table[WORK_COLUMNS].itertuples(index=False, name=None),
+                   df['authors'], df['editors'], df['referenced_works'])
+        for values, work_authors, work_editors, referenced_works in rows:
+            values = tuple(_value(value) for value in values)
+            people = {role: [dataclasses.asdict(person) for person in names] if isinstance(names, list) else []
+                      for role, names in (('authors', work_authors), ('editors', work_editors))}
+            cited = sorted(set(referenced_works)) if isinstance(referenced_works, list) else []
+            content = json.dumps([values, people, cited], ensure_ascii=False, sort_keys=True)
+            content_hash = hashlib.sha1(content.encode('utf-8')).hexdigest()
+            key = values[0] or values[WORK_COLUMNS.index('source_url')]
+            keys.append((key,))
+            if existing.get(key) == content_hash:
+                continue
+            works.append((key,) + values + (content_hash, now))
+            for role, names in people.items():
+                authors.extend((key, role, index, person['full_name'], person['given_name'], person['family_name'])
+                               for index, person in enumerate(names))
+            references.extend((key, referenced_id) for referenced_id in cited)
+
+        columns = ['work_key'] + WORK_COLUMNS + ['content_hash', 'updated_at']
+        updates = ', '.join(f"{column} = excluded.{column}" for column in columns[1:])
+        with self.connection:
+            changed = [(work[0],) for work in works]
+            # Children of changed works are rewritten whole; those of unchanged works are untouched.
+            self.connection.executemany("DELETE FROM authors WHERE work_key = ?", changed)
+            self.connection.executemany("DELETE FROM work_references WHERE work_key = ?", changed)
+            self.connection.executemany(f"""
+                INSERT INTO works ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})
+                ON CONFLICT (work_key) DO UPDATE SET {updates}
+            """, works)
+            self.connection.executemany("INSERT OR IGNORE INTO authors VALUES (?, ?, ?, ?, ?, ?)", authors)
+            self.connection.executemany("INSERT OR IGNORE INTO work_references VALUES (?, ?)", references)
+            deleted = self._delete_missing('works', ['work_key'], keys)
+        return len(works), deleted
+
+    def sync_records(self, records) -> tuple:
+        """Upserts the translated per-source records of a run, before enrichment and merge.
+
+        Returns (upserted, deleted).
+        """
+        now = _now()
+        existing = {(source_db, record_id): content_hash for source_db, record_id, content_hash
+                    in self.connection.execute("SELECT source_db, source_id, content_hash FROM records")}
+        rows, keys = [], []
+        for record in records:
+            key = (record.source_db, source_id(record))
+            keys.append(key)
+            content = json.dumps(dataclasses.asdict(record), ensure_ascii=False, sort_keys=True)
+            content_hash = hashlib.sha1(content.encode('utf-8')).hexdigest()
+            if existing.get(key) == content_hash:
+                continue
+            values = (normalize_doi(record.doi),) + tuple(_value(getattr(record, column)) for column in RECORD_COLUMNS[1:])
+            rows.append(key + values + (content, content_hash, now))
+
+        columns = ['source_db', 'source_id'] + RECORD_COLUMNS + ['record', 'content_hash', 'updated_at']
+        updates = ', '.join(f"{column} = excluded.{column}" for column in columns[2:])
+        with self.connection:
+            self.connection.executemany(f"""
+                INSERT INTO records ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})
+                ON CONFLICT (source_db, source_id) DO UPDATE SET {updates}
+            """, rows)
+            deleted = self._delete_missing('records', ['source_db', 'source_id'], keys)
+        return len(rows), deleted
@@ -0,0 +1,155 @@
+import email.utils
+import json
+import os
+import random
+import time
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import ResponseCache
+from .ratelimit import AdaptiveRateLimiter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The cache is on by default so that development re-runs are nearly free; set BLANCHOT_CACHE=0
+# to always hit the network.
+CACHE_ENABLED = os.environ.get('BLANCHOT_CACHE', '1') != '0'
+CACHE_DIR = os.environ.get('BLANCHOT_CACHE_DIR', os.path.join(PROJECT_ROOT, '.cache', 'http'))
+CACHE_TTL = float(os.environ.get('BLANCHOT_CACHE_TTL', 24 * 60 * 60))
+CACHE_MAX_BYTES = int(os.environ.get('BLANCHOT_CACHE_MAX_MB', 1024)) * 1024 * 1024
+# Crossref forgets a deep-paging cursor minutes after its last use, so a cached page would hand
+# back a next-cursor it no longer knows. Its cursor requests always go to the network.
+UNCACHED_PARAMS = {'api.crossref.org': 'cursor'}
+
+# Identifies us to OpenAlex's and Crossref's polite pools, which get faster, more stable service.
+MAILTO = os.environ.get('BLANCHOT_MAILTO')
+USER_AGENT = "blanchot-bibliography/1.0 (https://github.com/Kaiyu27/blanchot"
+USER_AGENT += f"; mailto:{MAILTO})" if MAILTO else ")"
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+TIMEOUT = 60
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Per-host request budgets (requests/second, concurrent requests), from each API's published limits.
+RATE_LIMITS = {
+    'api.openalex.org': (10, None),
+    'api.crossref.org': (10 if MAILTO else 5, 3 if MAILTO else 1),
+    'api.archives-ouvertes.fr': (5, None),
+}
+DEFAULT_RATE_LIMIT = (5, None)
+
+response_cache = ResponseCache(CACHE_DIR, CACHE_TTL, CACHE_MAX_BYTES)
+
+session = requests.Session()
+session.headers.update({'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip, deflate'})
+# One keep-alive pool per host, large enough for every harvest thread that talks to it.
+session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16))
+
+_limiters = {host: AdaptiveRateLimiter(rate, max_concurrency=concurrency)
+             for host, (rate, concurrency) in RATE_LIMITS.items()}
+
+def _limiter(host):
+    if host not in _limiters:
+        rate, concurrency = DEFAULT_RATE_LIMIT
+        _limiters.setdefault(host, AdaptiveRateLimiter(rate, max_concurrency=concurrency))
+    return _limiters[host]
+
+def _retry_after(response):
+    """Reads Retry-After, which may be a number of seconds or an HTTP date."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        retry_at = email.utils.parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+
+def _backoff(attempt):
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+def _request(url, params=None, headers=None):
+    """Sends a GET through the shared session, pacing it per host and retrying transient failures.
+
+    Connection errors, timeouts, 429s and 5xx answers are retried with exponential backoff (or
+    the server's Retry-After) up to MAX_RETRIES times; after that the last error is raised.
+    """
+    host = urllib.parse.urlsplit(url).netloc.lower()
+    limiter = _limiter(host)
+    params = dict(params or {})
+    if MAILTO and host in ('api.openalex.org', 'api.crossref.org'):
+        params.setdefault('mailto', MAILTO)
+
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=TIMEOUT)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt == MAX_RETRIES:
+                raise
+            time.sleep(_backoff(attempt))
+            continue
+        finally:
+            limiter.release()
+
+        if response.status_code not in RETRY_STATUSES:
+            limiter.on_success(response.headers)
+            return response
+        retry_after = _retry_after(response)
+        limiter.on_throttled(retry_after)
+        if attempt == MAX_RETRIES:
+            response.raise_for_status()
+        time.sleep(retry_after if retry_after is not None else _backoff(attempt))
+
+def _cacheable(url, params):
+    parts = urllib.parse.urlsplit(url)
+    param = UNCACHED_PARAMS.get(parts.netloc.lower())
+    if param is None:
+        return True
+    query = dict(urllib.parse.parse_qsl(parts.query), **(params or {}))
+    return param not in query
+
+def fetch(url, params=None):
+    """Returns the body of a GET request, served from the response cache when possible.
+
+    Fresh entries are returned without touching the network. Stale entries are revalidated with
+    If-None-Match/If-Modified-Since, and a 304 answer renews them. Error responses raise
+    requests.HTTPError and are never cached, and neither are requests carrying one of the
+    UNCACHED_PARAMS of their host.
+    """
+    if not CACHE_ENABLED or not _cacheable(url, params):
+        response = _request(url, params)
+        response.raise_for_status()
+        return response.content
+
+    key = response_cache.key(url, params)
+    cached = response_cache.get(key)
+    headers = {}
+    if cached is not None:
+        body, meta = cached
+        if response_cache.is_fresh(meta):
+            return body
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    response = _request(url, params, headers)
+    if response.status_code == 304 and cached is not None:
+        response_cache.touch(key, meta)
+        return body
+    response.raise_for_status()
+
+    response_cache.put(
+        key, response.content, response.url,
+        etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified')
+    )
+    return response.content
+
+def get_json(url, params=None):
+    """Fetches a URL through the response cache and decodes its JSON body."""
+    return json.loads(fetch(url, params))
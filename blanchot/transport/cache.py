@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.parse
+
+# Query parameters that identify us rather than the page: left out of the cache key and never
+# written to disk.
+PRIVATE_PARAMS = {'api_key', 'mailto'}
+
+def _public_query(query):
+    return [(k, v) for k, v in query if k not in PRIVATE_PARAMS]
+
+def redact(url):
+    """Returns the URL without its PRIVATE_PARAMS."""
+    parts = urllib.parse.urlsplit(url)
+    query = _public_query(urllib.parse.parse_qsl(parts.query, keep_blank_values=True))
+    return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache of API response bodies.
+
+    Entries are keyed by the SHA-256 of the normalized request (lower-cased host, path and the
+    sorted query parameters, without PRIVATE_PARAMS), so the same page requested with differently ordered or encoded
+    parameters hits the same entry. Each entry is a body file plus a small metadata file holding
+    the fetch time and any ETag/Last-Modified validators. Entries younger than `ttl` seconds are
+    served as-is; older ones are revalidated by the caller. Once the cache grows past `max_bytes`,
+    the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory, ttl, max_bytes):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+
+    @staticmethod
+    def key(url, params=None):
+        """Returns the cache key for a request, independent of parameter order and encoding."""
+        parts = urllib.parse.urlsplit(url)
+        query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        query += [(k, str(v)) for k, v in (params or {}).items() if v is not None]
+        query = _public_query(query)
+        normalized = urllib.parse.urlunsplit((
+            parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/') or '/',
+            urllib.parse.urlencode(sorted(query)), ''
+        ))
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        folder = os.path.join(self.directory, key[:2])
+        return os.path.join(folder, key), os.path.join(folder, f"{key}.meta")
+
+    def get(self, key):
+        """Returns (body, meta) for a cached entry, or None if there is none."""
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        # Reads count as use, so the access time drives LRU eviction.
+        os.utime(body_path)
+        return body, meta
+
+    def is_fresh(self, meta):
+        return time.time() - meta.get('fetched_at', 0) < self.ttl
+
+    def put(self, key, body, url, etag=None, last_modified=None):
+        """Stores a response body with its validators, replacing any previous entry atomically."""
+        body_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        previous_size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+        meta = {'url': redact(url), 'fetched_at': time.time(), 'etag': etag, 'last_modified': last_modified}
+        with self._lock:
+            self._current_size()
+        self._write_atomic(body_path, body)
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        with self._lock:
+            self._size += len(body) - previous_size
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def touch(self, key, meta):
+        """Marks an entry as freshly validated after the server answered 304 Not Modified."""
+        _, meta_path = self._paths(key)
+        meta = dict(meta, fetched_at=time.time())
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def evict(self):
+        """Deletes least recently used entries until the cache is back under 90% of its budget."""
+        with self._lock:
+            entries = []
+            for folder, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith('.meta') or name.endswith('.tmp'):
+                        continue
+                    path = os.path.join(folder, name)
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            size = sum(entry[1] for entry in entries)
+            target = self.max_bytes * 0.9
+            for _, entry_size, path in sorted(entries):
+                if size <= target:
+                    break
+                for stale in (path, f"{path}.meta"):
+                    try:
+                        os.remove(stale)
+                    except FileNotFoundError:
+                        pass
+                size -= entry_size
+            self._size = size
+
+    def _current_size(self):
+        if self._size is None:
+            self._size = sum(
+                os.path.getsize(os.path.join(folder, name))
+                for folder, _, files in os.walk(self.directory)
+                for name in files if not name.endswith('.meta')
+            )
+        return self._size
+
+    @staticmethod
+    def _write_atomic(path, data):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
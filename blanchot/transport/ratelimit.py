@@ -0,0 +1,68 @@
+import threading
+import time
+
+
+class AdaptiveRateLimiter:
+    """Token-bucket rate limiter for one API host that adapts to what the server tells it.
+
+    Requests take a token before they go out; tokens refill at `rate` per second up to `burst`.
+    A 429/503 halves the rate and, with Retry-After, pauses every request to the host for that
+    long; each success nudges the rate back up towards `max_rate`. Crossref's
+    X-Rate-Limit-Limit/X-Rate-Limit-Interval headers cap `max_rate` at what the server actually
+    allows, never above the configured rate. `max_concurrency` caps the requests in flight.
+    """
+
+    def __init__(self, rate, burst=None, max_concurrency=None):
+        self.ceiling = rate
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+
+    def acquire(self):
+        """Blocks until a request may be sent."""
+        if self._slots is not None:
+            self._slots.acquire()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def release(self):
+        """Frees the concurrency slot taken by acquire()."""
+        if self._slots is not None:
+            self._slots.release()
+
+    def on_success(self, headers):
+        with self._lock:
+            self._apply_limit_headers(headers)
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def on_throttled(self, retry_after=None):
+        with self._lock:
+            self.rate = max(self.max_rate / 32, self.rate / 2)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def _apply_limit_headers(self, headers):
+        limit = headers.get('X-Rate-Limit-Limit')
+        interval = headers.get('X-Rate-Limit-Interval')
+        try:
+            allowed = float(limit) / float(interval.rstrip('s'))
+        except (AttributeError, TypeError, ValueError, ZeroDivisionError):
+            return
+        if allowed > 0:
+            self.max_rate = min(self.ceiling, allowed)
+            self.rate = min(self.rate, self.max_rate)